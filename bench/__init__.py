@@ -0,0 +1,8 @@
+from collections.abc import Callable
+from timeit import Timer
+
+
+def run_benchmark(name: str, func: Callable[[], object], number: int) -> float:
+    best = min(Timer(func).repeat(repeat=5, number=number)) / number
+    print(f"{name:<48}{best * 1e6:>12.1f} us/call")
+    return best
@@ -0,0 +1,112 @@
+import json
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+COMICVINE_URL = "https://comicvine.gamespot.com/bench/4050-1/"
+TIMESTAMP = "2021-01-01 10:00:00"
+
+
+# the objects a stub libgen mirror serves, keyed by id like json.php does
+@dataclass
+class Catalog:
+    series: dict[str, dict[str, Any]] = field(default_factory=dict)
+    editions: dict[str, dict[str, Any]] = field(default_factory=dict)
+    files: dict[str, dict[str, Any]] = field(default_factory=dict)
+    unsorted_ids: list[str] = field(default_factory=list)
+
+    def objects(self, object_type: str) -> dict[str, dict[str, Any]]:
+        return {"s": self.series, "e": self.editions, "f": self.files}[object_type]
+
+    @classmethod
+    def generate(
+        cls,
+        n_files: int,
+        *,
+        files_per_edition: int = 2,
+        unsorted_files: int = 0,
+    ) -> "Catalog":
+        catalog = cls()
+        n_editions = max(1, n_files // files_per_edition)
+
+        catalog.series["1"] = {
+            "id": "1",
+            "title": "Bench Series",
+            "publisher": "Bench Comics",
+            "date_start": "2005-01-01",
+            "date_end": None,
+            "time_added": TIMESTAMP,
+            "time_last_modified": TIMESTAMP,
+            "add": {
+                "1": {"key": "309", "value": COMICVINE_URL},
+                "2": {"key": "101", "value": "English"},
+            },
+            "editions": {},
+        }
+
+        for number in range(1, n_editions + 1):
+            edition_id = str(100_000 + number)
+            catalog.series["1"]["editions"][edition_id] = {"e_id": edition_id}
+            catalog.editions[edition_id] = {
+                "id": edition_id,
+                "title": f"Bench Series #{number}",
+                "issue_total_number": str(number),
+                "author": "Someone",
+                "publisher": "Bench Comics",
+                "year": "2005",
+                "month": "01",
+                "day": "01",
+                "pages": "24",
+                "time_added": TIMESTAMP,
+                "time_last_modified": TIMESTAMP,
+                "files": {},
+            }
+
+        file_id = 1_000_000
+        for index in range(n_files):
+            file_id += 1
+            edition_id = str(100_000 + index % n_editions + 1)
+            catalog.editions[edition_id]["files"][str(file_id)] = {"f_id": str(file_id)}
+            catalog.files[str(file_id)] = generate_file(file_id)
+
+        for _ in range(unsorted_files):
+            file_id += 1
+            catalog.files[str(file_id)] = generate_file(file_id)
+            catalog.unsorted_ids.append(str(file_id))
+
+        return catalog
+
+    @classmethod
+    def load(cls, path: Path) -> "Catalog":
+        return cls(**json.loads(path.read_text()))
+
+    def save(self, path: Path) -> None:
+        path.write_text(
+            json.dumps(
+                {
+                    "series": self.series,
+                    "editions": self.editions,
+                    "files": self.files,
+                    "unsorted_ids": self.unsorted_ids,
+                }
+            )
+        )
+
+
+def generate_file(file_id: int) -> dict[str, Any]:
+    return {
+        "f_id": str(file_id),
+        "md5": f"{file_id:032x}",
+        "broken": "N",
+        "locator": f"C:\\comics\\Bench Series {file_id} (2005) (digital) (Bench).cbz",
+        "extension": "cbz",
+        "releaser": "",
+        "scan_type": "",
+        "scan_size": "1988x3056",
+        "dpi": "",
+        "filesize": "48213390",
+        "archive_files_pic_count": "24",
+        "file_create_date": TIMESTAMP,
+        "time_added": TIMESTAMP,
+        "time_last_modified": TIMESTAMP,
+    }
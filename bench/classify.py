@@ -0,0 +1,72 @@
+import json
+
+from bench import run_benchmark
+from libgencomics.common import check_response_error, check_response_html_error
+from libgencomics.errors import LibgenException
+
+FILES_JSON = json.dumps(
+    {
+        str(id): {
+            "f_id": str(id),
+            "md5": f"{id:032x}",
+            "broken": "N",
+            "locator": f"C:\\comics\\Some Series {id:03} (2012) (digital) (Empire).cbz",
+            "extension": "cbz",
+            "filesize": "48213390",
+            "scan_type": "",
+            "time_added": "2020-01-01 10:00:00",
+            "time_last_modified": "2021-01-01 10:00:00",
+        }
+        for id in range(200)
+    }
+)
+
+SEARCH_PAGE = (
+    "<html><head><title>Library Genesis</title></head><body>"
+    '<ul><li class="navbar-right"><a class="nav-link" '
+    'href="/json.php?object=s&ids=1,2,3">JSON</a></li></ul>'
+    + "".join(
+        f"<tr><td><a href='series.php?id={id}'>Series {id}</a></td></tr>"
+        for id in range(100)
+    )
+    + "</body></html>"
+)
+
+NGINX_503 = (
+    "<html><head><title>503 Service Temporarily Unavailable</title></head>"
+    "<body><center><h1>503 Service Temporarily Unavailable</h1></center>"
+    "<hr><center>nginx</center></body></html>"
+)
+
+CLOUDFLARE_524 = (
+    "<html><head><title>libgen.la | 524: A timeout occurred</title></head>"
+    "<body><div id='cf-error-details'>A timeout occurred</div></body></html>"
+)
+
+
+def classify(check, response: str) -> None:
+    try:
+        check("bench", response)
+    except LibgenException:
+        pass
+
+
+if __name__ == "__main__":
+    for name, response, number in [
+        ("json.php response (200 files)", FILES_JSON, 20),
+        ("search page", SEARCH_PAGE, 50),
+        ("nginx 503", NGINX_503, 500),
+        ("cloudflare 524", CLOUDFLARE_524, 500),
+    ]:
+        print(f"\n>>>\t{name} ({len(response)} bytes)")
+        fast = run_benchmark(
+            "check_response_error",
+            lambda: classify(check_response_error, response),
+            number,
+        )
+        html = run_benchmark(
+            "check_response_html_error",
+            lambda: classify(check_response_html_error, response),
+            number,
+        )
+        print(f"{'speedup':<48}{html / fast:>12.1f} x")
@@ -0,0 +1,44 @@
+import json
+from collections.abc import Callable
+from importlib import import_module
+from typing import Any
+
+from bench import run_benchmark
+from bench.catalog import Catalog
+from libgencomics.common import json_codec, split_json_response
+from libgencomics.libgen_objects import ResultFile
+
+BATCH_SIZE = 200
+
+
+def available_decoders() -> dict[str, Callable[[str], Any]]:
+    decoders: dict[str, Callable[[str], Any]] = {"json": json.loads}
+
+    for name, path in [("orjson", "orjson.loads"), ("msgspec", "msgspec.json.decode")]:
+        module, _, attr = path.rpartition(".")
+        try:
+            decoders[name] = getattr(import_module(module), attr)
+        except ImportError:
+            pass
+
+    return decoders
+
+
+def parse_batch(response: str) -> list[ResultFile]:
+    return [
+        ResultFile(id=int(id), libgen_site_url="http://bench", response=payload)
+        for id, payload in split_json_response(response).items()
+    ]
+
+
+if __name__ == "__main__":
+    catalog = Catalog.generate(BATCH_SIZE)
+    response = json.dumps(catalog.files)
+
+    print(f"\n>>>\tjson.php response ({BATCH_SIZE} files, {len(response)} bytes)")
+    for name, decode in available_decoders().items():
+        run_benchmark(f"decode with {name}", lambda: decode(response), 200)
+
+    print(f"\n>>>\tsplit and parse with the {json_codec.BACKEND} backend")
+    run_benchmark("split_json_response", lambda: split_json_response(response), 50)
+    run_benchmark("split_json_response + ResultFile", lambda: parse_batch(response), 20)
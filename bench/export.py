@@ -0,0 +1,81 @@
+import argparse
+import io
+import json
+import tempfile
+from pathlib import Path
+
+from bench import run_benchmark
+from bench.catalog import Catalog
+from libgencomics.export import CSVExporter, NDJSONExporter, export
+from libgencomics.export.exporters import pyarrow
+from libgencomics.libgen_objects import Edition, ResultFile, Series
+
+
+def parse_files(catalog: Catalog) -> list[ResultFile]:
+    series = {
+        id: Series(
+            id=int(id),
+            libgen_site_url="http://bench",
+            comicvine_url=None,
+            response=json.dumps({id: payload}),
+        )
+        for id, payload in catalog.series.items()
+    }
+    editions = {
+        id: Edition(
+            id=int(id),
+            libgen_site_url="http://bench",
+            series=next(iter(series.values())),
+            response=json.dumps({id: payload}),
+        )
+        for id, payload in catalog.editions.items()
+    }
+    edition_of_file = {
+        file_id: edition
+        for edition in editions.values()
+        for file_id in edition.file_ids
+    }
+
+    return [
+        ResultFile(
+            id=int(id),
+            libgen_site_url="http://bench",
+            issue=edition_of_file.get(id),
+            response=json.dumps({id: payload}),
+        )
+        for id, payload in catalog.files.items()
+    ]
+
+
+def object_by_object(files: list[ResultFile]) -> str:
+    return "\n".join(str(file) for file in files)
+
+
+def to_ndjson(files: list[ResultFile]) -> str:
+    output = io.StringIO()
+    NDJSONExporter(output, ResultFile).write_many(files)
+    return output.getvalue()
+
+
+def to_csv(files: list[ResultFile]) -> str:
+    output = io.StringIO()
+    CSVExporter(output, ResultFile).write_many(files)
+    return output.getvalue()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--files", type=int, default=10_000)
+    args = parser.parse_args()
+
+    files = parse_files(Catalog.generate(args.files))
+
+    print(f"\n>>>\texport {len(files)} files")
+    run_benchmark("str() of each file", lambda: object_by_object(files), 1)
+    run_benchmark("NDJSONExporter", lambda: to_ndjson(files), 1)
+    run_benchmark("CSVExporter", lambda: to_csv(files), 1)
+
+    if pyarrow is not None:
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory) / "files.parquet"
+            run_benchmark("parquet", lambda: export(files, path, ResultFile), 1)
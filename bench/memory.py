@@ -0,0 +1,74 @@
+import argparse
+import gc
+import json
+import tracemalloc
+from collections.abc import Callable
+
+from bench.catalog import Catalog
+from libgencomics.libgen_objects import Edition, ResultFile, Series
+
+SITE_URL = "http://bench"
+
+
+def footprint(name: str, build: Callable[[], list[object]]) -> float:
+    gc.collect()
+    tracemalloc.start()
+    objects = build()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    per_object = size / len(objects)
+    print(f"{name:<48}{per_object:>12.0f} B/object")
+    return per_object
+
+
+def payloads(objects: dict[str, dict]) -> dict[str, str]:
+    return {id: json.dumps({id: obj}) for id, obj in objects.items()}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--files", type=int, default=100_000)
+    args = parser.parse_args()
+
+    catalog = Catalog.generate(args.files)
+    series_payload = payloads(catalog.series)["1"]
+    edition_payloads = payloads(catalog.editions)
+    file_payloads = payloads(catalog.files)
+
+    for keep_json in (False, True):
+        print(f"\n>>>\tkeep_json={keep_json}")
+        series = Series(
+            id=1,
+            libgen_site_url=SITE_URL,
+            comicvine_url=None,
+            response=series_payload,
+            keep_json=keep_json,
+        )
+
+        footprint(
+            f"Edition ({len(edition_payloads)})",
+            lambda: [
+                Edition(
+                    id=int(id),
+                    libgen_site_url=SITE_URL,
+                    series=series,
+                    response=response,
+                    keep_json=keep_json,
+                )
+                for id, response in edition_payloads.items()
+            ],
+        )
+        footprint(
+            f"ResultFile ({len(file_payloads)})",
+            lambda: [
+                ResultFile(
+                    id=int(id),
+                    libgen_site_url=SITE_URL,
+                    issue=None,
+                    response=response,
+                    keep_json=keep_json,
+                )
+                for id, response in file_payloads.items()
+            ],
+        )
@@ -0,0 +1,83 @@
+import asyncio
+from collections.abc import Callable
+from time import perf_counter
+
+from bs4 import BeautifulSoup, FeatureNotFound
+
+from bench import run_benchmark
+from libgencomics.common import html_parser, parse_html, parse_off_loop
+
+ROWS = 2000
+
+
+def search_page(rows: int) -> str:
+    ids = ",".join(str(1000 + i) for i in range(rows))
+    body = "".join(
+        f"<tr><td><a href='series.php?id={1000 + i}'>Series {i}</a></td>"
+        f"<td class='text-muted'>{1960 + i % 60}</td><td>Publisher {i % 40}</td></tr>"
+        for i in range(rows)
+    )
+    paginator = "".join(f"<a href='index.php?page={n}'>{n}</a>" for n in range(1, 6))
+    return (
+        "<html><head><title>Library Genesis</title></head><body>"
+        "<ul><li class='navbar-right'>"
+        f"<a class='nav-link' href='/json.php?object=s&ids={ids}'>json</a>"
+        f"</li></ul><table>{body}</table>{paginator}</body></html>"
+    )
+
+
+def available_parsers() -> dict[str, Callable[[str], BeautifulSoup]]:
+    parsers: dict[str, Callable[[str], BeautifulSoup]] = {}
+
+    for name in ["html.parser", "lxml"]:
+        try:
+            BeautifulSoup("", name)
+        except FeatureNotFound:
+            continue
+        parsers[name] = lambda markup, name=name: BeautifulSoup(markup, name)
+
+    return parsers
+
+
+# the longest the event loop went without running a ticker while pages were
+# being parsed
+async def loop_stall(markup: str, pages: int, off_loop: bool) -> float:
+    worst = 0.0
+    done = False
+
+    async def ticker() -> None:
+        nonlocal worst
+        last = perf_counter()
+        while not done:
+            await asyncio.sleep(0.001)
+            now = perf_counter()
+            worst = max(worst, now - last)
+            last = now
+
+    task = asyncio.create_task(ticker())
+    await asyncio.sleep(0.01)
+
+    for _ in range(pages):
+        if off_loop:
+            await parse_off_loop(parse_html, markup)
+        else:
+            parse_html(markup)
+        await asyncio.sleep(0)
+
+    done = True
+    await task
+    return worst
+
+
+if __name__ == "__main__":
+    markup = search_page(ROWS)
+
+    print(f"\n>>>\tsearch page ({ROWS} rows, {len(markup)} bytes)")
+    for name, parse in available_parsers().items():
+        run_benchmark(f"parse with {name}", lambda: parse(markup), 5)
+
+    print(f"\n>>>\tevent loop stall with the {html_parser.BACKEND} backend")
+    for off_loop in [False, True]:
+        stall = asyncio.run(loop_stall(markup, 10, off_loop))
+        label = "parse_off_loop" if off_loop else "parse on the loop"
+        print(f"{label:<48}{stall * 1e3:>12.1f} ms max")
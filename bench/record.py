@@ -0,0 +1,87 @@
+import argparse
+import asyncio
+from pathlib import Path
+
+from libgencomics.common import CONSTANTS, FetchEngine, fetch_multiple_ids
+from libgencomics.search import SearchRequest
+
+from .catalog import Catalog
+
+
+# records the objects of real series so that they can be replayed by the stub
+async def record(
+    site: str,
+    series_ids: list[int],
+    query: str | None,
+    flaresolverr_url: str | None,
+) -> Catalog:
+    catalog = Catalog()
+
+    async with FetchEngine() as engine:
+        catalog.series = await fetch_multiple_ids(
+            site,
+            CONSTANTS.SERIES_REQUEST,
+            series_ids,
+            flaresolverr_url,
+            engine=engine,
+        )
+
+        edition_ids = [
+            edition_id
+            for series in catalog.series.values()
+            for edition_id in (series.get("editions") or {}).keys()
+        ]
+        catalog.editions = await fetch_multiple_ids(
+            site,
+            CONSTANTS.EDITION_REQUEST,
+            edition_ids,
+            flaresolverr_url,
+            engine=engine,
+        )
+
+        if query is not None:
+            catalog.unsorted_ids = await SearchRequest(
+                query=query,
+                start_year=None,
+                comicvine_url="",
+                libgen_site_url=site,
+                flaresolverr_url=flaresolverr_url,
+                engine=engine,
+            ).get_unsorted_files_ids()
+
+        file_ids = [
+            str(result_file["f_id"])
+            for edition in catalog.editions.values()
+            for result_file in (edition.get("files") or {}).values()
+        ] + catalog.unsorted_ids
+        catalog.files = await fetch_multiple_ids(
+            site,
+            CONSTANTS.RESULT_FILE_REQUEST,
+            file_ids,
+            flaresolverr_url,
+            engine=engine,
+        )
+
+    return catalog
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Record libgen series as fixtures for the benchmark suite"
+    )
+    parser.add_argument("--site", default="https://libgen.la")
+    parser.add_argument("--series", type=int, nargs="+", required=True)
+    parser.add_argument("--query", help="also record the unsorted files search")
+    parser.add_argument("--flaresolverr-url")
+    parser.add_argument("--output", type=Path, required=True)
+    args = parser.parse_args()
+
+    catalog = asyncio.run(
+        record(args.site, args.series, args.query, args.flaresolverr_url)
+    )
+    catalog.save(args.output)
+
+    print(
+        f"Recorded {len(catalog.series)} series, {len(catalog.editions)} editions "
+        f"and {len(catalog.files)} files to {args.output}"
+    )
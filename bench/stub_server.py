@@ -0,0 +1,127 @@
+import asyncio
+import json
+import random
+from dataclasses import dataclass
+
+from aiohttp import web
+
+from .catalog import Catalog
+
+NGINX_503 = (
+    "<html><head><title>503 Service Temporarily Unavailable</title></head>"
+    "<body><center><h1>503 Service Temporarily Unavailable</h1></center>"
+    "<hr><center>nginx</center></body></html>"
+)
+
+NGINX_414 = (
+    "<html><head><title>414 Request-URI Too Large</title></head>"
+    "<body><center><h1>414 Request-URI Too Large</h1></center>"
+    "<hr><center>nginx</center></body></html>"
+)
+
+
+@dataclass
+class StubStats:
+    requests: int = 0
+    rate_limited: int = 0
+    bytes_sent: int = 0
+
+
+# serves index.php search pages and json.php objects out of a catalog
+class StubLibgen:
+    def __init__(
+        self,
+        catalog: Catalog,
+        *,
+        latency: float = 0.0,
+        rate_limit_probability: float = 0.0,
+        max_ids: int | None = None,
+    ) -> None:
+        self.catalog = catalog
+        self.latency = latency
+        self.rate_limit_probability = rate_limit_probability
+        self.max_ids = max_ids
+        self.stats = StubStats()
+        self.__runner: web.AppRunner | None = None
+        self.url = ""
+
+    async def __respond(self, text: str, content_type: str) -> web.Response:
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        self.stats.bytes_sent += len(text)
+        return web.Response(text=text, content_type=content_type)
+
+    async def json_php(self, request: web.Request) -> web.Response:
+        self.stats.requests += 1
+
+        if random.random() < self.rate_limit_probability:
+            self.stats.rate_limited += 1
+            return await self.__respond(NGINX_503, "text/html")
+
+        ids = request.query.get("ids", "").split(",")
+        if self.max_ids is not None and len(ids) > self.max_ids:
+            return await self.__respond(NGINX_414, "text/html")
+
+        objects = self.catalog.objects(request.query["object"])
+        fields = request.query.get("fields", "*")
+
+        found = {id: objects[id] for id in ids if id in objects}
+        if fields != "*":
+            keys = fields.split(",")
+            found = {
+                id: {key: obj.get(key) for key in keys} for id, obj in found.items()
+            }
+
+        return await self.__respond(json.dumps(found), "text/html")
+
+    async def index_php(self, request: web.Request) -> web.Response:
+        self.stats.requests += 1
+
+        paginator = ""
+
+        if request.query.get("objects[]") == "s":
+            link = "/json.php?object=s&ids=" + ",".join(self.catalog.series.keys())
+        else:
+            paging = int(request.query.get("res", "25"))
+            page = int(request.query.get("page", "1"))
+            start = (page - 1) * paging
+            link = "/json.php?object=f&ids=" + ",".join(
+                self.catalog.unsorted_ids[start : start + paging]
+            )
+
+            n_pages = -(-len(self.catalog.unsorted_ids) // paging)
+            if n_pages > 1:
+                paginator = (
+                    '<ul class="pagination">'
+                    + "".join(
+                        f'<li class="page-item"><a class="page-link" '
+                        f'href="{request.rel_url.update_query(page=n)}">{n}</a></li>'
+                        for n in range(1, n_pages + 1)
+                    )
+                    + "</ul>"
+                )
+
+        return await self.__respond(
+            "<html><head><title>Library Genesis</title></head><body><ul>"
+            f'<li class="navbar-right"><a class="nav-link" href="{link}">JSON</a>'
+            f"</li></ul>{paginator}</body></html>",
+            "text/html",
+        )
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        app = web.Application()
+        app.router.add_get("/json.php", self.json_php)
+        app.router.add_get("/index.php", self.index_php)
+
+        self.__runner = web.AppRunner(app, access_log=None)
+        await self.__runner.setup()
+        site = web.TCPSite(self.__runner, host, port)
+        await site.start()
+
+        port = site._server.sockets[0].getsockname()[1]  # type: ignore
+        self.url = f"http://{host}:{port}"
+        return self.url
+
+    async def stop(self) -> None:
+        if self.__runner is not None:
+            await self.__runner.cleanup()
@@ -0,0 +1,213 @@
+import argparse
+import asyncio
+import json
+import tracemalloc
+from pathlib import Path
+from time import perf_counter
+from types import SimpleNamespace
+from typing import cast
+
+from simyan.schemas.volume import Volume
+
+from libgencomics import LibgenSearch
+from libgencomics.common import (
+    CONSTANTS,
+    FetchEngine,
+    RateController,
+    RateLimits,
+    fetch_multiple_urls,
+    split_json_response,
+)
+from libgencomics.libgen_objects import Edition, ResultFile, Series
+
+from .catalog import Catalog
+from .stub_server import StubLibgen
+
+BENCH_VOLUME_ID = 1
+
+
+# the stub never rate limits unless asked to, let the engine go as fast as it can
+def unthrottled() -> RateController:
+    return RateController(
+        RateLimits(initial_rate=1_000_000, max_rate=1_000_000, burst=1_000_000)
+    )
+
+
+def bench_volume(catalog: Catalog) -> Volume:
+    series = next(iter(catalog.series.values()))
+    site_url = next(
+        (
+            added["value"]
+            for added in (series.get("add") or {}).values()
+            if str(added["value"]).startswith("https://comicvine.gamespot.com")
+        ),
+        "",
+    )
+    start_year = (series.get("date_start") or "0").split("-")[0]
+
+    return cast(
+        Volume,
+        SimpleNamespace(
+            name=series.get("title") or "",
+            start_year=int(start_year),
+            site_url=site_url,
+        ),
+    )
+
+
+async def search(stub: StubLibgen, catalog: Catalog) -> int:
+    async with LibgenSearch(rate_controller=unthrottled()) as libgen_search:
+        libgen_search.get_comicvine_resolver("bench").remember(
+            BENCH_VOLUME_ID, bench_volume(catalog)
+        )
+        files = await libgen_search.search_comicvine_id(
+            api_key="bench",
+            id=BENCH_VOLUME_ID,
+            libgen_site_url=stub.url,
+            libgen_series_id=None,
+            search_unsorted=len(catalog.unsorted_ids) != 0,
+        )
+    return len(files)
+
+
+async def bench_search(stub: StubLibgen, catalog: Catalog) -> dict[str, float]:
+    stub.stats.requests = 0
+    start = perf_counter()
+    n_files = await search(stub, catalog)
+    latency = perf_counter() - start
+
+    tracemalloc.start()
+    await search(stub, catalog)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "search_latency_s": latency,
+        "search_requests": stub.stats.requests / 2,
+        "search_files": n_files,
+        "search_peak_memory_mb": peak / 1024 / 1024,
+    }
+
+
+async def bench_fetch(stub: StubLibgen, catalog: Catalog) -> dict[str, float]:
+    urls = [
+        stub.url + CONSTANTS.RESULT_FILE_REQUEST + file_id
+        for file_id in catalog.files.keys()
+    ]
+
+    async with FetchEngine(rate_controller=unthrottled()) as engine:
+        start = perf_counter()
+        await fetch_multiple_urls(urls, None, engine)
+        elapsed = perf_counter() - start
+
+    return {"fetch_urls_per_s": len(urls) / elapsed}
+
+
+def bench_parse(stub: StubLibgen, catalog: Catalog) -> dict[str, float]:
+    series_payloads = split_json_response(json.dumps(catalog.series))
+    edition_payloads = split_json_response(json.dumps(catalog.editions))
+    file_payloads = split_json_response(json.dumps(catalog.files))
+
+    start = perf_counter()
+    series = [
+        Series(
+            id=int(id),
+            libgen_site_url=stub.url,
+            comicvine_url=None,
+            response=payload,
+        )
+        for id, payload in series_payloads.items()
+    ]
+    series_time = perf_counter() - start
+
+    start = perf_counter()
+    editions = [
+        Edition(
+            id=int(id),
+            libgen_site_url=stub.url,
+            series=series[0],
+            response=payload,
+        )
+        for id, payload in edition_payloads.items()
+    ]
+    edition_time = perf_counter() - start
+
+    start = perf_counter()
+    for id, payload in file_payloads.items():
+        ResultFile(
+            id=int(id),
+            libgen_site_url=stub.url,
+            issue=editions[0],
+            response=payload,
+        )
+    file_time = perf_counter() - start
+
+    return {
+        "parse_series_us": series_time / len(series_payloads) * 1e6,
+        "parse_edition_us": edition_time / len(edition_payloads) * 1e6,
+        "parse_file_us": file_time / len(file_payloads) * 1e6,
+    }
+
+
+async def run_scale(catalog: Catalog, args: argparse.Namespace) -> dict[str, float]:
+    stub = StubLibgen(
+        catalog,
+        latency=args.latency / 1000,
+        rate_limit_probability=args.rate_limit_probability,
+        max_ids=args.max_ids,
+    )
+    await stub.start()
+
+    try:
+        results: dict[str, float] = {"files": len(catalog.files)}
+        results.update(await bench_search(stub, catalog))
+        results.update(await bench_fetch(stub, catalog))
+        results.update(bench_parse(stub, catalog))
+    finally:
+        await stub.stop()
+
+    return results
+
+
+def print_results(results: list[dict[str, float]]) -> None:
+    columns = list(results[0].keys())
+    print("".join(f"{column:>24}" for column in columns))
+    for row in results:
+        print("".join(f"{row[column]:>24.2f}" for column in columns))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Benchmark libgencomics against a local stub libgen mirror"
+    )
+    parser.add_argument(
+        "--scales",
+        default="10,100,1000,10000",
+        help="comma separated numbers of files to generate",
+    )
+    parser.add_argument(
+        "--fixtures",
+        type=Path,
+        nargs="*",
+        default=[],
+        help="catalogs recorded with bench.record to replay instead",
+    )
+    parser.add_argument("--unsorted-files", type=int, default=0)
+    parser.add_argument("--latency", type=float, default=0, help="in milliseconds")
+    parser.add_argument("--rate-limit-probability", type=float, default=0)
+    parser.add_argument("--max-ids", type=int, default=None)
+    parser.add_argument("--output", type=Path, help="append results as json lines")
+    args = parser.parse_args()
+
+    catalogs = [Catalog.load(path) for path in args.fixtures] or [
+        Catalog.generate(int(scale), unsorted_files=args.unsorted_files)
+        for scale in args.scales.split(",")
+    ]
+
+    results = [asyncio.run(run_scale(catalog, args)) for catalog in catalogs]
+    print_results(results)
+
+    if args.output is not None:
+        with args.output.open("a") as output:
+            for row in results:
+                output.write(json.dumps(row) + "\n")
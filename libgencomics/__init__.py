@@ -1,5 +1,19 @@
+from .cache import MemorySearchCache as MemorySearchCache
+from .cache import ObjectCache as ObjectCache
+from .cache import SearchCache as SearchCache
+from .cache import SQLiteObjectCache as SQLiteObjectCache
+from .cache import SQLiteSearchCache as SQLiteSearchCache
+from .common import FetchEngine as FetchEngine
+from .common import FetchLimits as FetchLimits
+from .common import InMemoryMetrics as InMemoryMetrics
+from .common import MetricsCollector as MetricsCollector
+from .common import MirrorPool as MirrorPool
+from .common import RateController as RateController
+from .common import RateLimits as RateLimits
+from .common import RetryPolicy as RetryPolicy
 from .errors import LibgenBadGatewayException as LibgenBadGatewayException
 from .errors import LibgenException as LibgenException
+from .errors import LibgenFlareSolverrException as LibgenFlareSolverrException
 from .errors import (
     LibgenMaxUserConnectionsException as LibgenMaxUserConnectionsException,
 )
@@ -9,13 +23,26 @@ from .errors import LibgenRateLimitedException as LibgenRateLimitedException
 from .errors import (
     LibgenRequestURITooLargeException as LibgenRequestURITooLargeException,
 )
+from .errors import (
+    LibgenRetriesExhaustedException as LibgenRetriesExhaustedException,
+)
 from .errors import (
     LibgenSSLHandshakeFailedException as LibgenSSLHandshakeFailedException,
 )
 from .errors import LibgenTimeoutException as LibgenTimeoutException
+from .export import ArrowExporter as ArrowExporter
+from .export import CSVExporter as CSVExporter
+from .export import Exporter as Exporter
+from .export import NDJSONExporter as NDJSONExporter
+from .export import export as export
+from .export import open_exporter as open_exporter
 from .libgen_objects import Edition as Edition
 from .libgen_objects import ResultFile as ResultFile
 from .libgen_objects import Series as Series
+from .search import AnnasArchiveResolver as AnnasArchiveResolver
 from .search import LibgenSearch as LibgenSearch
 from .search import SearchRequest as SearchRequest
 from .search import get_annas_archive_download as get_annas_archive_download
+from .sync import SQLiteSyncStateStore as SQLiteSyncStateStore
+from .sync import SyncDelta as SyncDelta
+from .sync import SyncStateStore as SyncStateStore
@@ -0,0 +1,6 @@
+from .object_cache import CachedObject as CachedObject
+from .object_cache import ObjectCache as ObjectCache
+from .search_cache import MemorySearchCache as MemorySearchCache
+from .search_cache import SearchCache as SearchCache
+from .sqlite_object_cache import SQLiteObjectCache as SQLiteObjectCache
+from .sqlite_search_cache import SQLiteSearchCache as SQLiteSearchCache
@@ -0,0 +1,43 @@
+from dataclasses import dataclass
+from datetime import timedelta
+from time import time
+
+
+@dataclass
+class CachedObject:
+    payload: str
+    time_last_modified: str | None
+    stored_at: float
+
+
+class ObjectCache:
+    def __init__(self, *, ttl: timedelta = timedelta(days=1)) -> None:
+        self.ttl = ttl
+
+    # fresh objects can be used without asking the mirror if they changed
+    def is_fresh(self, cached: CachedObject) -> bool:
+        return time() - cached.stored_at < self.ttl.total_seconds()
+
+    def get_many(
+        self, site: str, object_type: str, ids: list[str]
+    ) -> dict[str, CachedObject]:
+        raise NotImplementedError()
+
+    # entries map ids to their payload and time_last_modified
+    def set_many(
+        self,
+        site: str,
+        object_type: str,
+        entries: dict[str, tuple[str, str | None]],
+    ) -> None:
+        raise NotImplementedError()
+
+    # marks objects which were revalidated as unchanged as fresh again
+    def touch_many(self, site: str, object_type: str, ids: list[str]) -> None:
+        raise NotImplementedError()
+
+    def delete_many(self, site: str, object_type: str, ids: list[str]) -> None:
+        raise NotImplementedError()
+
+    def clear(self) -> None:
+        raise NotImplementedError()
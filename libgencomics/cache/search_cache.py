@@ -0,0 +1,70 @@
+from collections import OrderedDict
+from datetime import timedelta
+from time import time
+
+
+# maps search urls to the ids they found, searches which found nothing are
+# kept for less time since the series could be added at any moment
+class SearchCache:
+    def __init__(
+        self,
+        *,
+        ttl: timedelta = timedelta(minutes=30),
+        negative_ttl: timedelta = timedelta(minutes=5),
+    ) -> None:
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+
+    def expires_at(self, ids: list[str]) -> float:
+        ttl = self.ttl if len(ids) != 0 else self.negative_ttl
+        return time() + ttl.total_seconds()
+
+    def get(self, key: str) -> list[str] | None:
+        raise NotImplementedError()
+
+    def set(self, key: str, ids: list[str]) -> None:
+        raise NotImplementedError()
+
+    def delete(self, key: str) -> None:
+        raise NotImplementedError()
+
+    def clear(self) -> None:
+        raise NotImplementedError()
+
+
+class MemorySearchCache(SearchCache):
+    def __init__(
+        self,
+        *,
+        ttl: timedelta = timedelta(minutes=30),
+        negative_ttl: timedelta = timedelta(minutes=5),
+        max_entries: int = 4096,
+    ) -> None:
+        super().__init__(ttl=ttl, negative_ttl=negative_ttl)
+        self.max_entries = max_entries
+        self.__searches: OrderedDict[str, tuple[list[str], float]] = OrderedDict()
+
+    def get(self, key: str) -> list[str] | None:
+        if key not in self.__searches:
+            return None
+
+        ids, expires_at = self.__searches[key]
+        if expires_at <= time():
+            del self.__searches[key]
+            return None
+
+        self.__searches.move_to_end(key)
+        return list(ids)
+
+    def set(self, key: str, ids: list[str]) -> None:
+        self.__searches[key] = (list(ids), self.expires_at(ids))
+        self.__searches.move_to_end(key)
+
+        while len(self.__searches) > self.max_entries:
+            self.__searches.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        self.__searches.pop(key, None)
+
+    def clear(self) -> None:
+        self.__searches.clear()
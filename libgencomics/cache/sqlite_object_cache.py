@@ -0,0 +1,171 @@
+import sqlite3
+import zlib
+from datetime import timedelta
+from pathlib import Path
+from time import time
+
+from .object_cache import CachedObject, ObjectCache
+
+# sqlite limits the number of variables in a single statement
+MAX_VARIABLES = 500
+
+
+class SQLiteObjectCache(ObjectCache):
+    def __init__(
+        self,
+        path: Path | str | None = None,
+        *,
+        ttl: timedelta = timedelta(days=1),
+        max_entries: int | None = None,
+        max_size: int | None = None,
+    ) -> None:
+        super().__init__(ttl=ttl)
+
+        if path is None:
+            path = Path.home() / ".cache" / "libgencomics" / "cache.sqlite"
+            path.parent.mkdir(parents=True, exist_ok=True)
+
+        self.max_entries = max_entries
+        self.max_size = max_size
+
+        self.connection = sqlite3.connect(path)
+        self.connection.execute(
+            """CREATE TABLE IF NOT EXISTS objects (
+                site TEXT NOT NULL,
+                object_type TEXT NOT NULL,
+                id TEXT NOT NULL,
+                payload BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                time_last_modified TEXT,
+                stored_at REAL NOT NULL,
+                accessed_at REAL NOT NULL,
+                PRIMARY KEY (site, object_type, id)
+            )"""
+        )
+        self.connection.execute(
+            "CREATE INDEX IF NOT EXISTS objects_accessed_at ON objects (accessed_at)"
+        )
+        self.connection.commit()
+
+    def get_many(
+        self, site: str, object_type: str, ids: list[str]
+    ) -> dict[str, CachedObject]:
+        found: dict[str, CachedObject] = {}
+
+        for x in range(0, len(ids), MAX_VARIABLES):
+            chunk = ids[x : x + MAX_VARIABLES]
+            placeholders = ",".join("?" * len(chunk))
+
+            rows = self.connection.execute(
+                "SELECT id, payload, time_last_modified, stored_at FROM objects "
+                f"WHERE site = ? AND object_type = ? AND id IN ({placeholders})",
+                [site, object_type, *chunk],
+            ).fetchall()
+
+            for id, payload, time_last_modified, stored_at in rows:
+                found[id] = CachedObject(
+                    payload=zlib.decompress(payload).decode(),
+                    time_last_modified=time_last_modified,
+                    stored_at=stored_at,
+                )
+
+        self.__update_access(site, object_type, list(found.keys()))
+        return found
+
+    def set_many(
+        self,
+        site: str,
+        object_type: str,
+        entries: dict[str, tuple[str, str | None]],
+    ) -> None:
+        now = time()
+        rows = []
+
+        for id, (payload, time_last_modified) in entries.items():
+            compressed = zlib.compress(payload.encode())
+            rows.append(
+                (
+                    site,
+                    object_type,
+                    id,
+                    compressed,
+                    len(compressed),
+                    time_last_modified,
+                    now,
+                    now,
+                )
+            )
+
+        self.connection.executemany(
+            "INSERT OR REPLACE INTO objects VALUES (?, ?, ?, ?, ?, ?, ?, ?)", rows
+        )
+        self.connection.commit()
+        self.evict()
+
+    def touch_many(self, site: str, object_type: str, ids: list[str]) -> None:
+        now = time()
+        self.connection.executemany(
+            "UPDATE objects SET stored_at = ?, accessed_at = ? "
+            "WHERE site = ? AND object_type = ? AND id = ?",
+            [(now, now, site, object_type, id) for id in ids],
+        )
+        self.connection.commit()
+
+    def delete_many(self, site: str, object_type: str, ids: list[str]) -> None:
+        self.connection.executemany(
+            "DELETE FROM objects WHERE site = ? AND object_type = ? AND id = ?",
+            [(site, object_type, id) for id in ids],
+        )
+        self.connection.commit()
+
+    def clear(self) -> None:
+        self.connection.execute("DELETE FROM objects")
+        self.connection.commit()
+
+    # drops the least recently used objects until the cache fits its limits
+    def evict(self) -> None:
+        if self.max_entries is not None:
+            self.connection.execute(
+                "DELETE FROM objects WHERE rowid IN ("
+                "SELECT rowid FROM objects ORDER BY accessed_at DESC "
+                "LIMIT -1 OFFSET ?)",
+                [self.max_entries],
+            )
+
+        if self.max_size is not None:
+            total_size = self.connection.execute(
+                "SELECT COALESCE(SUM(size), 0) FROM objects"
+            ).fetchone()[0]
+
+            if total_size > self.max_size:
+                rows = self.connection.execute(
+                    "SELECT rowid, size FROM objects ORDER BY accessed_at"
+                ).fetchall()
+                to_delete: list[tuple[int]] = []
+
+                for rowid, size in rows:
+                    if total_size <= self.max_size:
+                        break
+                    to_delete.append((rowid,))
+                    total_size -= size
+
+                self.connection.executemany(
+                    "DELETE FROM objects WHERE rowid = ?", to_delete
+                )
+
+        self.connection.commit()
+
+    def __update_access(self, site: str, object_type: str, ids: list[str]) -> None:
+        if len(ids) == 0:
+            return
+
+        now = time()
+        self.connection.executemany(
+            "UPDATE objects SET accessed_at = ? "
+            "WHERE site = ? AND object_type = ? AND id = ?",
+            [(now, site, object_type, id) for id in ids],
+        )
+        self.connection.commit()
+
+    def close(self) -> None:
+        self.connection.close()
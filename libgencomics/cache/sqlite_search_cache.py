@@ -0,0 +1,63 @@
+import json
+import sqlite3
+from datetime import timedelta
+from pathlib import Path
+from time import time
+
+from .search_cache import SearchCache
+
+
+class SQLiteSearchCache(SearchCache):
+    def __init__(
+        self,
+        path: Path | str | None = None,
+        *,
+        ttl: timedelta = timedelta(minutes=30),
+        negative_ttl: timedelta = timedelta(minutes=5),
+    ) -> None:
+        super().__init__(ttl=ttl, negative_ttl=negative_ttl)
+
+        if path is None:
+            path = Path.home() / ".cache" / "libgencomics" / "search.sqlite"
+            path.parent.mkdir(parents=True, exist_ok=True)
+
+        self.connection = sqlite3.connect(path)
+        self.connection.execute(
+            """CREATE TABLE IF NOT EXISTS searches (
+                key TEXT PRIMARY KEY,
+                ids TEXT NOT NULL,
+                expires_at REAL NOT NULL
+            )"""
+        )
+        self.connection.commit()
+
+    def get(self, key: str) -> list[str] | None:
+        row = self.connection.execute(
+            "SELECT ids FROM searches WHERE key = ? AND expires_at > ?",
+            (key, time()),
+        ).fetchone()
+
+        if row is None:
+            return None
+
+        return json.loads(row[0])
+
+    def set(self, key: str, ids: list[str]) -> None:
+        self.connection.execute(
+            "INSERT OR REPLACE INTO searches (key, ids, expires_at) VALUES (?, ?, ?)",
+            (key, json.dumps(ids), self.expires_at(ids)),
+        )
+        # expired searches are never read again
+        self.connection.execute("DELETE FROM searches WHERE expires_at <= ?", (time(),))
+        self.connection.commit()
+
+    def delete(self, key: str) -> None:
+        self.connection.execute("DELETE FROM searches WHERE key = ?", (key,))
+        self.connection.commit()
+
+    def clear(self) -> None:
+        self.connection.execute("DELETE FROM searches")
+        self.connection.commit()
+
+    def close(self) -> None:
+        self.connection.close()
@@ -0,0 +1,208 @@
+import argparse
+import os
+import sys
+from asyncio import Queue, TaskGroup, run, to_thread
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, TextIO
+
+from libgencomics.cache import SQLiteObjectCache, SQLiteSearchCache
+from libgencomics.common import CONSTANTS, json_codec
+from libgencomics.libgen_objects import ResultFile
+from libgencomics.search import LibgenSearch
+
+
+@dataclass
+class VolumeRequest:
+    id: int
+    issue_number: float | tuple[float, float] | None = None
+    libgen_series_id: int | list[int] | None = None
+
+
+def parse_issue_number(field: str) -> float | tuple[float, float] | None:
+    if field == "-":
+        return None
+
+    start, _, end = field.partition("-")
+    if end:
+        return (float(start), float(end))
+    return float(start)
+
+
+def parse_series_ids(field: str) -> int | list[int] | None:
+    if field == "-":
+        return None
+
+    ids = [int(id) for id in field.split(",")]
+    return ids[0] if len(ids) == 1 else ids
+
+
+# each line holds a comicvine volume id, optionally followed by an issue number
+# or range (34.2, 13-14) and comma separated libgen series ids, "-" skips one
+def parse_volume_line(line: str) -> VolumeRequest | None:
+    fields = line.split("#", 1)[0].split()
+
+    if len(fields) == 0:
+        return None
+    if len(fields) > 3:
+        raise ValueError(f"too many fields in {line.strip()!r}")
+
+    return VolumeRequest(
+        id=int(fields[0]),
+        issue_number=parse_issue_number(fields[1]) if len(fields) > 1 else None,
+        libgen_series_id=parse_series_ids(fields[2]) if len(fields) > 2 else None,
+    )
+
+
+def file_record(volume: VolumeRequest, file: ResultFile) -> dict[str, Any]:
+    return {
+        "comicvine_id": volume.id,
+        "series_id": None if file.issue is None else file.issue.series.id,
+        "edition_id": None if file.issue is None else file.issue.id,
+        **file.__json__(),
+    }
+
+
+def write_line(output: TextIO, record: dict[str, Any]) -> None:
+    output.write(json_codec.dumps(record) + "\n")
+
+
+# lines are read as they are needed and volumes are searched by a fixed number
+# of workers, with every in-memory cache bounded, so memory does not grow with
+# the size of the input
+async def search_volumes(
+    args: argparse.Namespace, input: TextIO, output: TextIO
+) -> int:
+    volumes: Queue[VolumeRequest | None] = Queue(maxsize=args.concurrency * 2)
+    libgen_cache = None if args.cache is None else SQLiteObjectCache(args.cache)
+    search_cache = (
+        None if args.search_cache is None else SQLiteSearchCache(args.search_cache)
+    )
+    n_failed = 0
+
+    async def read_volumes() -> None:
+        nonlocal n_failed
+
+        while line := await to_thread(input.readline):
+            try:
+                volume = parse_volume_line(line)
+            except ValueError as e:
+                write_line(sys.stderr, {"line": line.strip(), "error": str(e)})
+                n_failed += 1
+                continue
+
+            if volume is not None:
+                await volumes.put(volume)
+
+        for _ in range(args.concurrency):
+            await volumes.put(None)
+
+    async def search_volume(search: LibgenSearch, volume: VolumeRequest) -> None:
+        async for file in search.stream_comicvine_id(
+            api_key=args.api_key,
+            id=volume.id,
+            libgen_site_url=args.libgen_site_url,
+            libgen_series_id=volume.libgen_series_id,
+            issue_number=volume.issue_number,
+            search_unsorted=args.search_unsorted,
+            libgen_cache=libgen_cache,
+            flaresolverr_url=args.flaresolverr_url,
+            batch_size=args.batch_size,
+        ):
+            if not file.broken:
+                write_line(output, file_record(volume, file))
+        output.flush()
+
+    async def worker(search: LibgenSearch) -> None:
+        nonlocal n_failed
+
+        while (volume := await volumes.get()) is not None:
+            try:
+                await search_volume(search, volume)
+            except Exception as e:
+                write_line(
+                    sys.stderr,
+                    {"comicvine_id": volume.id, "error": f"{type(e).__name__}: {e}"},
+                )
+                n_failed += 1
+
+    try:
+        async with LibgenSearch(
+            search_cache=search_cache, issue_index_size=args.issue_index_size
+        ) as search:
+            async with TaskGroup() as group:
+                group.create_task(read_volumes())
+                for _ in range(args.concurrency):
+                    group.create_task(worker(search))
+    finally:
+        if libgen_cache is not None:
+            libgen_cache.close()
+        if search_cache is not None:
+            search_cache.close()
+
+    return 1 if n_failed != 0 else 0
+
+
+def get_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="libgencomics",
+        description="Search Library Genesis for many Comicvine volumes and print "
+        "the files found as json lines",
+    )
+    parser.add_argument(
+        "input",
+        nargs="?",
+        default="-",
+        help="file with one volume per line: comicvine id, then optionally an "
+        "issue number or range and libgen series ids (default: stdin)",
+    )
+    parser.add_argument(
+        "--api-key",
+        default=os.environ.get("COMICVINE_API_KEY"),
+        help="Comicvine api key (default: $COMICVINE_API_KEY)",
+    )
+    parser.add_argument("--libgen-site-url", default="https://libgen.la")
+    parser.add_argument("--flaresolverr-url")
+    parser.add_argument(
+        "--no-unsorted",
+        dest="search_unsorted",
+        action="store_false",
+        help="do not search for unsorted files",
+    )
+    parser.add_argument(
+        "--concurrency", type=int, default=8, help="volumes searched at once"
+    )
+    parser.add_argument("--batch-size", type=int, default=CONSTANTS.IDS_PER_REQUEST)
+    parser.add_argument(
+        "--issue-index-size",
+        type=int,
+        default=1024,
+        help="series whose editions are kept indexed by issue number",
+    )
+    parser.add_argument("--cache", type=Path, help="sqlite cache of libgen objects")
+    parser.add_argument("--search-cache", type=Path, help="sqlite cache of searches")
+    parser.add_argument("--output", type=Path, help="(default: stdout)")
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = get_parser()
+    args = parser.parse_args(argv)
+
+    if args.api_key is None:
+        parser.error("a Comicvine api key is needed, use --api-key")
+    if args.concurrency < 1:
+        parser.error("--concurrency has to be at least 1")
+
+    input = sys.stdin if args.input == "-" else open(args.input)
+    output = sys.stdout if args.output is None else open(args.output, "w")
+
+    try:
+        return run(search_volumes(args, input, output))
+    except KeyboardInterrupt:
+        return 130
+    finally:
+        if input is not sys.stdin:
+            input.close()
+        if output is not sys.stdout:
+            output.close()
@@ -1,55 +1,110 @@
-import json
-import resource
-from asyncio import gather, sleep
-from collections.abc import Callable
+import re
+import sys
+from asyncio import (
+    FIRST_COMPLETED,
+    Future,
+    Task,
+    as_completed,
+    create_task,
+    gather,
+    sleep,
+    wait,
+)
+from collections.abc import AsyncIterator, Callable
 from inspect import isfunction
+from time import perf_counter
 from typing import Any
+from urllib.parse import parse_qs, urlsplit
 
 import aiohttp
 import requests
 from bs4 import BeautifulSoup
 
+from libgencomics.cache import ObjectCache
 from libgencomics.errors import (
     LibgenBadGatewayException,
+    LibgenException,
     LibgenMaxUserConnectionsException,
     LibgenNginxException,
     LibgenNginxRateLimitedException,
     LibgenRateLimitedException,
     LibgenRequestURITooLargeException,
+    LibgenRetriesExhaustedException,
     LibgenSSLHandshakeFailedException,
     LibgenTimeoutException,
 )
 
+from . import html_parser as html_parser
+from . import json_codec as json_codec
+from .engine import FetchEngine as FetchEngine
+from .flaresolverr import FLARESOLVERR_TIMEOUT as FLARESOLVERR_TIMEOUT
+from .flaresolverr import FlareSolverrPool as FlareSolverrPool
+from .flaresolverr import flaresolverr_command as flaresolverr_command
+from .flaresolverr import solution_body as solution_body
+from .html_parser import OFF_LOOP_THRESHOLD as OFF_LOOP_THRESHOLD
+from .html_parser import parse_html as parse_html
+from .html_parser import parse_off_loop as parse_off_loop
+from .json_codec import Payload as Payload
+from .limits import FetchLimits as FetchLimits
+from .metrics import InMemoryMetrics as InMemoryMetrics
+from .metrics import MetricsCollector as MetricsCollector
+from .mirrors import MIRROR_FAILURE_EXCEPTIONS as MIRROR_FAILURE_EXCEPTIONS
+from .mirrors import MirrorPool as MirrorPool
+from .rate_controller import RateController as RateController
+from .rate_controller import RateLimits as RateLimits
+from .retry import RetryPolicy as RetryPolicy
+from .single_flight import SingleFlight as SingleFlight
+
 __session = requests.Session()
 
+JSON_BODY = re.compile(r"\s*[\[{]")
+# anything which could be one of the error pages check_response_html_error
+# recognizes, responses without any of these are never parsed as html
+ERROR_SIGNATURES = re.compile(
+    r"<center>"
+    r"|Request-URI Too Large"
+    r"|524: A timeout occurred"
+    r"|525: SSL handshake failed"
+    r"|max_user_connections"
+    r"|Could not connect to the database"
+    r"|Too many requests for"
+    r"|Bad gateway"
+)
+NGINX_PAGE = re.compile(
+    r"<center>(?:<h1>)?([^<]*)(?:</h1>)?</center>\s*<hr>\s*<center>nginx</center>"
+)
+TITLE = re.compile(r"<title>([^<]*)</title>")
+
 
 class CONSTANTS:
     EDITION_REQUEST = "/json.php?object=e&ids="
     RESULT_FILE_REQUEST = "/json.php?object=f&ids="
     SERIES_REQUEST = "/json.php?object=s&fields=*&addkeys=309,101&ids="
 
+    # only asks for the modification time of the objects
+    REVALIDATE_REQUEST = "/json.php?object={}&fields=id,time_last_modified&ids="
 
+    # json.php accepts a comma separated list of ids
+    IDS_PER_REQUEST = 200
+
+    # largest page size index.php allows
+    UNSORTED_PAGING = 100
+    # pages fetched at once when their count is unknown
+    UNSORTED_PAGES_PER_WINDOW = 4
+    MAX_UNSORTED_PAGES = 50
+
+
+# stateless, every call opens a new browser, prefer FetchEngine.solve which
+# keeps sessions and their cookies around
 async def flaresolverr_get(
     session: aiohttp.ClientSession, url: str, flaresolverr_url: str
 ) -> str:
-    data = {
-        "cmd": "request.get",
-        "url": url,
-        "maxTimeout": 60000,  # 60 seconds
-    }
-    response = await session.post(
+    result = await flaresolverr_command(
+        session,
         flaresolverr_url,
-        data=json.dumps(data),
-        headers={"Content-Type": "application/json"},
+        {"cmd": "request.get", "url": url, "maxTimeout": FLARESOLVERR_TIMEOUT},
     )
-    result = await response.json()
-    real_response = result["solution"]["response"]
-    soup = BeautifulSoup(real_response, "html.parser")
-    json_body = soup.select_one("pre")
-
-    if json_body is not None:
-        return json_body.get_text()
-    return real_response
+    return solution_body(result["solution"])
 
 
 def attempt_request(url: str) -> str:
@@ -61,19 +116,163 @@ def attempt_request(url: str) -> str:
     return __session.get(url).text
 
 
+# returns the url which actually served the response along with it, rate
+# feedback has to go to that host and not to the canonical one
 async def fetch_data(
-    session: aiohttp.ClientSession, url: str, flaresolverr_url: str | None
-) -> str:
+    engine: FetchEngine, url: str, flaresolverr_url: str | None
+) -> tuple[str, str]:
     if flaresolverr_url is not None:
-        return await flaresolverr_get(session, url, flaresolverr_url)
-    async with session.get(url) as response:
-        data = await response.text()
-        response.close()
-        return data
+        return url, await engine.solve(url, flaresolverr_url)
+    if (pool := engine.mirror_pool(url)) is not None:
+        return await fetch_from_mirrors(engine, pool, url)
+    return url, await engine.get(url)
+
+
+# returns the mirror's url, the response and whether the mirror failed to
+# serve it, its latency is only measured from when the request is sent
+async def fetch_from_mirror(
+    engine: FetchEngine,
+    pool: MirrorPool,
+    url: str,
+    mirror: str,
+    on_sent: Callable[[float], None],
+) -> tuple[str, str, bool]:
+    mirror_url = pool.rewrite(url, mirror)
+    start = 0.0
+
+    def sent(at: float) -> None:
+        nonlocal start
+        start = at
+        on_sent(at)
+
+    try:
+        response = await engine.get(mirror_url, sent)
+    except (aiohttp.ClientError, TimeoutError) as e:
+        pool.on_failure(mirror)
+        raise e
+
+    try:
+        check_response_error(mirror_url, response)
+    except MIRROR_FAILURE_EXCEPTIONS:
+        pool.on_failure(mirror)
+        return mirror_url, response, True
+    # anything else, like rate limits, is handled by the caller
+    except LibgenException:
+        return mirror_url, response, False
+
+    pool.on_success(mirror, perf_counter() - start)
+    return mirror_url, response, False
+
 
+# tries the mirrors from the best to the worst until one of them answers, a
+# second request is sent to the next one if the first is too slow, the
+# response of the last mirror is returned if they all failed
+async def fetch_from_mirrors(
+    engine: FetchEngine, pool: MirrorPool, url: str
+) -> tuple[str, str]:
+    mirrors = iter(pool.ranked())
+    pending: set[Task[tuple[str, str, bool]]] = set()
+    hedged = pool.hedge_after is None
+    failed_response: tuple[str, str] | None = None
+    error: BaseException | None = None
+    # when the request to the last mirror tried was sent, time spent waiting
+    # for a slot or a token does not count towards hedging
+    sent_at: float | None = None
+
+    def on_sent(at: float) -> None:
+        nonlocal sent_at
+        sent_at = at
+
+    def try_next_mirror() -> bool:
+        nonlocal sent_at
+        if (mirror := next(mirrors, None)) is None:
+            return False
+        sent_at = None
+        pending.add(create_task(fetch_from_mirror(engine, pool, url, mirror, on_sent)))
+        return True
+
+    def hedge_timeout() -> float | None:
+        if hedged or pool.hedge_after is None:
+            return None
+        if sent_at is None:
+            return pool.hedge_after
+        return max(0.0, sent_at + pool.hedge_after - perf_counter())
+
+    try_next_mirror()
+
+    try:
+        while len(pending) != 0:
+            done, _ = await wait(
+                pending, timeout=hedge_timeout(), return_when=FIRST_COMPLETED
+            )
+
+            if len(done) == 0:
+                # still waiting to be sent, or sent less than hedge_after ago
+                if sent_at is None or hedge_timeout() != 0:
+                    continue
+
+                hedged = True
+                try_next_mirror()
+                continue
+
+            for task in done:
+                pending.discard(task)
+
+                if (e := task.exception()) is not None:
+                    error = e
+                    continue
+
+                mirror_url, response, failed = task.result()
+                if not failed:
+                    return mirror_url, response
+                failed_response = (mirror_url, response)
+
+            if len(pending) == 0:
+                try_next_mirror()
+    finally:
+        for task in pending:
+            task.cancel()
+
+    if failed_response is None:
+        raise error or LibgenException(url)
+    return failed_response
+
+
+def check_engine_response(engine: FetchEngine, url: str, response: str) -> str:
+    start = perf_counter()
+    try:
+        return check_response_error(url, response)
+    finally:
+        engine.metrics.on_check(url, perf_counter() - start)
 
-def check_response_error(url: str, response: str) -> tuple[str, BeautifulSoup]:
-    soup = BeautifulSoup(response, "html.parser")
+
+def check_response_error(url: str, response: str) -> str:
+    if JSON_BODY.match(response) is not None or not ERROR_SIGNATURES.search(response):
+        return response
+
+    if (nginx := NGINX_PAGE.search(response)) is not None:
+        text = nginx.group(1)
+        if text.startswith("503 Service Temporarily Unavailable"):
+            raise LibgenNginxRateLimitedException(url)
+        elif text.startswith("414 Request-URI Too Large"):
+            raise LibgenRequestURITooLargeException(url)
+        raise LibgenNginxException(text + "\n" + url)
+
+    # the nginx check has to come first, any other center tag needs the parser
+    if "<center>" not in response and (title := TITLE.search(response)) is not None:
+        if title.group(1).count("Request-URI Too Large") != 0:
+            raise LibgenRequestURITooLargeException(url)
+        elif title.group(1).count("524: A timeout occurred") != 0:
+            raise LibgenTimeoutException(url)
+        elif title.group(1).count("525: SSL handshake failed") != 0:
+            raise LibgenSSLHandshakeFailedException(url)
+
+    check_response_html_error(url, response)
+    return response
+
+
+def check_response_html_error(url: str, response: str) -> BeautifulSoup:
+    soup = parse_html(response)
     title = (
         opt_chain(
             soup,
@@ -87,6 +286,8 @@ def check_response_error(url: str, response: str) -> tuple[str, BeautifulSoup]:
         text = opt_chain(soup.find_all("center"), 0, "string") or ""
         if text.startswith("503 Service Temporarily Unavailable"):
             raise LibgenNginxRateLimitedException(url)
+        elif text.startswith("414 Request-URI Too Large"):
+            raise LibgenRequestURITooLargeException(url)
         raise LibgenNginxException(text + "\n" + url)
     elif title.count("Request-URI Too Large") != 0:
         raise LibgenRequestURITooLargeException(url)
@@ -119,7 +320,7 @@ def check_response_error(url: str, response: str) -> tuple[str, BeautifulSoup]:
     ).count("Bad gateway") != 0:
         raise LibgenBadGatewayException(url)
 
-    return (response, soup)
+    return soup
 
 
 def is_valid_response(url: str, response: str) -> bool:
@@ -134,63 +335,405 @@ def is_valid_response(url: str, response: str) -> bool:
         return False
 
 
+# returns None when the url needs to be retried
+async def fetch_valid_data(
+    engine: FetchEngine, url: str, flaresolverr_url: str | None
+) -> str | None:
+    served_url, response = await fetch_data(engine, url, None)
+
+    try:
+        check_engine_response(engine, url, response)
+        engine.rate_controller.on_success(served_url)
+        return response
+    except (
+        LibgenMaxUserConnectionsException,
+        LibgenNginxRateLimitedException,
+        LibgenTimeoutException,
+    ) as e:
+        engine.rate_controller.on_error(served_url, e)
+        engine.metrics.on_retry(url, e)
+    except LibgenRateLimitedException as e:
+        engine.rate_controller.on_error(served_url, e)
+        if flaresolverr_url:
+            _, fresponse = await fetch_data(engine, url, flaresolverr_url)
+            if is_valid_response(url, fresponse):
+                return fresponse
+        engine.metrics.on_retry(url, e)
+
+    return None
+
+
+# retries the url on its own until it gets a valid response or runs out of
+# attempts, on top of the pacing of the engine's rate controller
+async def fetch_url(engine: FetchEngine, url: str, flaresolverr_url: str | None) -> str:
+    policy = engine.retry_policy
+    error: BaseException | None = None
+
+    for attempt in range(1, policy.max_attempts + 1):
+        try:
+            if (
+                response := await fetch_valid_data(engine, url, flaresolverr_url)
+            ) is not None:
+                return response
+        except (aiohttp.ClientError, TimeoutError) as e:
+            error = e
+
+        if attempt != policy.max_attempts:
+            await sleep(policy.delay(attempt))
+
+    raise LibgenRetriesExhaustedException(url) from error
+
+
+async def fetch_urls(
+    urls: list[str],
+    flaresolverr_url: str | None,
+    engine: FetchEngine | None = None,
+) -> dict[str, str]:
+    if engine is None:
+        async with FetchEngine() as engine:
+            return await fetch_urls(urls, flaresolverr_url, engine)
+
+    unique_urls = list(dict.fromkeys(urls))
+
+    # every url gets its own task, the engine's limiter bounds how many of
+    # them are in flight and starts a new one as soon as a slot frees up
+    responses = await gather(
+        *[fetch_url(engine, url, flaresolverr_url) for url in unique_urls]
+    )
+    return dict(zip(unique_urls, responses))
+
+
+# responses are in the same order as their urls
 async def fetch_multiple_urls(
     urls: list[str],
     flaresolverr_url: str | None,
-    _file_limit: int | None = None,
+    engine: FetchEngine | None = None,
 ) -> list[str]:
-    if _file_limit is not None:
-        file_limit = _file_limit
-    else:
+    responses = await fetch_urls(urls, flaresolverr_url, engine)
+    return [responses[url] for url in urls]
+
+
+# splits a json.php response containing many objects into one payload per id,
+# the response is only decoded once and the payloads are never encoded again
+def split_json_response(response: str) -> dict[str, Payload]:
+    json_obj = json_codec.loads(response)
+
+    if not isinstance(json_obj, dict):
+        return {}
+
+    return {str(id): obj for id, obj in json_obj.items()}
+
+
+# payloads are only serialized to be stored in the object cache, in the shape
+# of a json.php response so that existing caches can still be read
+def encode_payload(id: str, payload: Payload) -> str:
+    return json_codec.dumps({id: payload})
+
+
+def decode_payload(cached: str) -> Payload:
+    return next(iter(json_codec.loads(cached).values()))
+
+
+def request_object_type(request: str) -> str:
+    return parse_qs(urlsplit(request).query)["object"][0]
+
+
+def payload_time_last_modified(payload: Payload) -> str | None:
+    return opt_chain(payload, "time_last_modified")
+
+
+async def fetch_id_batch(
+    libgen_site_url: str,
+    request: str,
+    batch: list[str],
+    flaresolverr_url: str | None,
+    engine: FetchEngine,
+) -> dict[str, Payload]:
+    url = served_url = libgen_site_url + request + ",".join(batch)
+
+    try:
         try:
-            file_limit, _ = resource.getrlimit(resource.RLIMIT_NOFILE)
-        except Exception:
-            file_limit = 1024
-
-    async with aiohttp.ClientSession() as session:
-        chunks = [urls[x : x + file_limit] for x in range(0, len(urls), file_limit)]
-
-        to_retry: list[str] = []
-        final_requests: list[str] = []
-
-        for chunk in chunks:
-            current_requests = await gather(
-                *[
-                    fetch_data(
-                        session,
-                        url,
-                        None,
-                    )
-                    for url in chunk
-                ]
+            served_url, response = await fetch_data(engine, url, None)
+            check_engine_response(engine, url, response)
+            engine.rate_controller.on_success(served_url)
+        except LibgenRequestURITooLargeException as e:
+            raise e
+        except LibgenException as e:
+            engine.rate_controller.on_error(served_url, e)
+            engine.metrics.on_retry(url, e)
+            response = await fetch_url(engine, url, flaresolverr_url)
+        # dropped connections and timeouts get the same retries as any other
+        # url, instead of failing the whole search
+        except (aiohttp.ClientError, TimeoutError) as e:
+            engine.metrics.on_retry(url, e)
+            response = await fetch_url(engine, url, flaresolverr_url)
+    # the retry above can also come back as too large
+    except LibgenRequestURITooLargeException as e:
+        if len(batch) == 1:
+            raise e
+
+        engine.metrics.on_retry(url, e)
+
+        half = len(batch) // 2
+        payloads: dict[str, Payload] = {}
+
+        for halves in await gather(
+            fetch_id_batch(
+                libgen_site_url, request, batch[:half], flaresolverr_url, engine
+            ),
+            fetch_id_batch(
+                libgen_site_url, request, batch[half:], flaresolverr_url, engine
+            ),
+        ):
+            payloads.update(halves)
+
+        return payloads
+
+    return split_json_response(response)
+
+
+# resolves the ids other requests are waiting on once their batch is fetched,
+# they are abandoned if it fails or gets cancelled, even before it started
+def create_shared_id_batch_task(
+    libgen_site_url: str,
+    request: str,
+    batch: list[str],
+    flaresolverr_url: str | None,
+    engine: FetchEngine,
+) -> Task[dict[str, Payload]]:
+    def release(task: Task[dict[str, Payload]]) -> None:
+        payloads = (
+            task.result() if not task.cancelled() and task.exception() is None else None
+        )
+
+        for id in batch:
+            if payloads is not None:
+                engine.in_flight.resolve(
+                    (libgen_site_url, request, id), payloads.get(id)
+                )
+            else:
+                engine.in_flight.abandon((libgen_site_url, request, id))
+
+    task = create_task(
+        fetch_id_batch(libgen_site_url, request, batch, flaresolverr_url, engine)
+    )
+    task.add_done_callback(release)
+    return task
+
+
+async def wait_for_shared_ids(
+    libgen_site_url: str,
+    request: str,
+    futures: dict[str, Future[Payload | None]],
+    flaresolverr_url: str | None,
+    engine: FetchEngine,
+) -> dict[str, Payload]:
+    await wait(futures.values())
+
+    payloads: dict[str, Payload] = {}
+    abandoned: list[str] = []
+
+    for id, future in futures.items():
+        if future.cancelled():
+            abandoned.append(id)
+        elif (payload := future.result()) is not None:
+            payloads[id] = payload
+
+    if len(abandoned) != 0:
+        payloads.update(
+            await fetch_id_batch(
+                libgen_site_url, request, abandoned, flaresolverr_url, engine
+            )
+        )
+
+    return payloads
+
+
+# yields the payloads of each batch of ids as soon as it has been fetched
+async def stream_multiple_ids(
+    libgen_site_url: str,
+    request: str,
+    ids: list[int] | list[str],
+    flaresolverr_url: str | None,
+    batch_size: int = CONSTANTS.IDS_PER_REQUEST,
+    engine: FetchEngine | None = None,
+    cache: ObjectCache | None = None,
+) -> AsyncIterator[dict[str, Payload]]:
+    if engine is None:
+        async with FetchEngine() as engine:
+            async for payloads in stream_multiple_ids(
+                libgen_site_url,
+                request,
+                ids,
+                flaresolverr_url,
+                batch_size,
+                engine,
+                cache,
+            ):
+                yield payloads
+        return
+
+    unique_ids = list(dict.fromkeys(str(id) for id in ids))
+
+    if cache is not None:
+        async for payloads in stream_cached_ids(
+            libgen_site_url,
+            request,
+            unique_ids,
+            flaresolverr_url,
+            batch_size,
+            engine,
+            cache,
+        ):
+            yield payloads
+        return
+
+    # ids already being fetched by another request are awaited instead
+    shared: dict[str, Future[Payload | None]] = {}
+    owned_ids: list[str] = []
+
+    for id in unique_ids:
+        if (future := engine.in_flight.get((libgen_site_url, request, id))) is not None:
+            shared[id] = future
+        else:
+            engine.in_flight.claim((libgen_site_url, request, id))
+            owned_ids.append(id)
+
+    batch_size = max(batch_size, 1)
+    tasks = [
+        create_shared_id_batch_task(
+            libgen_site_url,
+            request,
+            owned_ids[x : x + batch_size],
+            flaresolverr_url,
+            engine,
+        )
+        for x in range(0, len(owned_ids), batch_size)
+    ]
+
+    if len(shared) != 0:
+        tasks.append(
+            create_task(
+                wait_for_shared_ids(
+                    libgen_site_url, request, shared, flaresolverr_url, engine
+                )
             )
-            for index, req in enumerate(current_requests):
-                try:
-                    if is_valid_response(chunk[index], req):
-                        final_requests.append(req)
-                    else:
-                        to_retry.append(chunk[index])
-                except LibgenNginxRateLimitedException:
-                    to_retry.append(chunk[index])
-                except LibgenRateLimitedException:
-                    if flaresolverr_url:
-                        freq = await fetch_data(session, chunk[index], flaresolverr_url)
-                        if is_valid_response(chunk[index], freq):
-                            final_requests.append(freq)
-                        else:
-                            to_retry.append(chunk[index])
-                    else:
-                        to_retry.append(chunk[index])
-
-    if len(to_retry) != 0:
-        await sleep(5)
-        new_file_limit = int(file_limit / 2)
-        new_file_limit = new_file_limit if new_file_limit >= 1 else file_limit
-        final_requests += await fetch_multiple_urls(
-            to_retry, flaresolverr_url, new_file_limit
         )
 
-    return final_requests
+    try:
+        for task in as_completed(tasks):
+            yield await task
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+async def fetch_multiple_ids(
+    libgen_site_url: str,
+    request: str,
+    ids: list[int] | list[str],
+    flaresolverr_url: str | None,
+    batch_size: int = CONSTANTS.IDS_PER_REQUEST,
+    engine: FetchEngine | None = None,
+    cache: ObjectCache | None = None,
+) -> dict[str, Payload]:
+    payloads: dict[str, Payload] = {}
+
+    async for batch_payloads in stream_multiple_ids(
+        libgen_site_url,
+        request,
+        ids,
+        flaresolverr_url,
+        batch_size,
+        engine,
+        cache,
+    ):
+        payloads.update(batch_payloads)
+
+    return payloads
+
+
+async def stream_cached_ids(
+    libgen_site_url: str,
+    request: str,
+    ids: list[str],
+    flaresolverr_url: str | None,
+    batch_size: int,
+    engine: FetchEngine,
+    cache: ObjectCache,
+) -> AsyncIterator[dict[str, Payload]]:
+    object_type = request_object_type(request)
+    cached = cache.get_many(libgen_site_url, object_type, ids)
+
+    found_ids: set[str] = set()
+    fresh: dict[str, Payload] = {}
+    stale_ids: list[str] = []
+
+    for id, cached_object in cached.items():
+        if cache.is_fresh(cached_object):
+            fresh[id] = decode_payload(cached_object.payload)
+        else:
+            stale_ids.append(id)
+
+    if len(fresh) != 0:
+        found_ids.update(fresh.keys())
+        yield fresh
+
+    # stale objects are only fetched again if the mirror says they changed
+    if len(stale_ids) != 0:
+        modified = await fetch_multiple_ids(
+            libgen_site_url,
+            CONSTANTS.REVALIDATE_REQUEST.format(object_type),
+            stale_ids,
+            flaresolverr_url,
+            batch_size,
+            engine,
+        )
+        unchanged_ids = [
+            id
+            for id in stale_ids
+            if id in modified
+            and payload_time_last_modified(modified[id])
+            == cached[id].time_last_modified
+        ]
+
+        cache.touch_many(libgen_site_url, object_type, unchanged_ids)
+
+        if len(unchanged_ids) != 0:
+            found_ids.update(unchanged_ids)
+            yield {id: decode_payload(cached[id].payload) for id in unchanged_ids}
+
+    missing_ids = [id for id in ids if id not in found_ids]
+
+    if len(missing_ids) != 0:
+        async for fetched in stream_multiple_ids(
+            libgen_site_url,
+            request,
+            missing_ids,
+            flaresolverr_url,
+            batch_size,
+            engine,
+        ):
+            cache.set_many(
+                libgen_site_url,
+                object_type,
+                {
+                    id: (
+                        encode_payload(id, payload),
+                        payload_time_last_modified(payload),
+                    )
+                    for id, payload in fetched.items()
+                },
+            )
+            found_ids.update(fetched.keys())
+            yield fetched
+
+        # objects which no longer exist on the mirror
+        cache.delete_many(
+            libgen_site_url,
+            object_type,
+            [id for id in missing_ids if id in cached and id not in found_ids],
+        )
 
 
 # attempts to chain attributes, indexes or functions of the root object
@@ -216,6 +759,11 @@ def opt_chain(
     return result
 
 
+# values repeated across many objects, like publishers, share one string
+def interned(value: Any) -> str:
+    return sys.intern(str(value))
+
+
 def parse_value[T](
     obj: dict[str, str],
     key: str,
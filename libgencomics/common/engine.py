@@ -0,0 +1,133 @@
+from collections.abc import Callable
+from time import perf_counter
+from types import TracebackType
+from typing import Any
+from urllib.parse import urlsplit
+
+import aiohttp
+from yarl import URL
+
+from .flaresolverr import FlareSolverrPool, solution_body
+from .json_codec import Payload
+from .limits import ConcurrencyLimiter, FetchLimits
+from .metrics import MetricsCollector
+from .mirrors import MirrorPool
+from .rate_controller import RateController
+from .retry import RetryPolicy
+from .single_flight import SingleFlight
+
+
+class FetchEngine:
+    def __init__(
+        self,
+        limits: FetchLimits | None = None,
+        rate_controller: RateController | None = None,
+        metrics: MetricsCollector | None = None,
+        mirrors: list[MirrorPool] | None = None,
+        retry_policy: RetryPolicy | None = None,
+    ) -> None:
+        self.limits = limits or FetchLimits()
+        self.limiter = ConcurrencyLimiter(self.limits)
+        self.rate_controller = rate_controller or RateController()
+        self.metrics = metrics or MetricsCollector()
+        self.mirrors = mirrors or []
+        self.retry_policy = retry_policy or RetryPolicy()
+        # maps (site, request, id) to the payload of objects being fetched
+        self.in_flight: SingleFlight[tuple[str, str, str], Payload | None] = (
+            SingleFlight()
+        )
+        # maps search urls to the ids of searches being made
+        self.searches_in_flight: SingleFlight[str, list[str]] = SingleFlight()
+        self.flaresolverr_pools: dict[str, FlareSolverrPool] = {}
+        # user agent of the browser which got the clearance cookies of a host,
+        # the cookies are only honoured when sent along with it
+        self.user_agents: dict[str, str] = {}
+        self.__session: aiohttp.ClientSession | None = None
+
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        if self.__session is None or self.__session.closed:
+            self.__session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=self.limits.max_connections,
+                    limit_per_host=self.limits.max_connections_per_host,
+                    ttl_dns_cache=self.limits.dns_cache_ttl,
+                    keepalive_timeout=self.limits.keepalive_timeout,
+                )
+            )
+        return self.__session
+
+    # on_sent is called with the time the request is sent at, once it got
+    # both its slot and its token
+    async def get(
+        self, url: str, on_sent: Callable[[float], None] | None = None
+    ) -> str:
+        user_agent = self.user_agents.get(urlsplit(url).netloc)
+        headers = None if user_agent is None else {"User-Agent": user_agent}
+
+        # the slot is taken first so that only the requests which could be
+        # sent right away wait on the pacing of their host
+        async with self.limiter.slot(url):
+            await self.rate_controller.acquire(url)
+            start = perf_counter()
+            if on_sent is not None:
+                on_sent(start)
+            async with self.session.get(url, headers=headers) as response:
+                body = await response.read()
+                text = await response.text()
+            self.metrics.on_request(url, perf_counter() - start, len(body))
+            return text
+
+    def mirror_pool(self, url: str) -> MirrorPool | None:
+        return next((pool for pool in self.mirrors if pool.serves(url)), None)
+
+    def flaresolverr(self, flaresolverr_url: str) -> FlareSolverrPool:
+        if flaresolverr_url not in self.flaresolverr_pools:
+            self.flaresolverr_pools[flaresolverr_url] = FlareSolverrPool(
+                flaresolverr_url, size=self.limits.flaresolverr_sessions
+            )
+        return self.flaresolverr_pools[flaresolverr_url]
+
+    def has_clearance(self, url: str) -> bool:
+        return urlsplit(url).netloc in self.user_agents
+
+    # gets the url through a browser and keeps the cookies it was given so
+    # that the next requests to the same host can be made directly
+    async def solve(self, url: str, flaresolverr_url: str) -> str:
+        start = perf_counter()
+        solution = await self.flaresolverr(flaresolverr_url).solve(self.session, url)
+        self.metrics.on_flaresolverr(url, perf_counter() - start)
+
+        self.remember_clearance(url, solution)
+        return solution_body(solution)
+
+    def remember_clearance(self, url: str, solution: dict[str, Any]) -> None:
+        cookies: list[dict[str, Any]] = solution.get("cookies") or []
+        user_agent: str | None = solution.get("userAgent")
+
+        if len(cookies) == 0 or user_agent is None:
+            return
+
+        self.session.cookie_jar.update_cookies(
+            {cookie["name"]: cookie["value"] for cookie in cookies},
+            response_url=URL(solution.get("url") or url),
+        )
+        self.user_agents[urlsplit(url).netloc] = user_agent
+
+    async def close(self) -> None:
+        if self.__session is not None:
+            for pool in self.flaresolverr_pools.values():
+                await pool.close(self.__session)
+            await self.__session.close()
+            self.__session = None
+
+    async def __aenter__(self) -> "FetchEngine":
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        await self.close()
@@ -0,0 +1,158 @@
+import json
+from asyncio import Condition
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager, suppress
+from typing import Any
+
+import aiohttp
+
+from libgencomics.errors import LibgenFlareSolverrException
+
+from .html_parser import parse_html
+
+FLARESOLVERR_TIMEOUT = 60000  # 60 seconds
+
+
+async def flaresolverr_command(
+    session: aiohttp.ClientSession, flaresolverr_url: str, data: dict[str, Any]
+) -> dict[str, Any]:
+    async with session.post(
+        flaresolverr_url,
+        data=json.dumps(data),
+        headers={"Content-Type": "application/json"},
+    ) as response:
+        return await response.json()
+
+
+# the page flaresolverr got, json bodies are wrapped in a <pre> by the browser
+def solution_body(solution: dict[str, Any]) -> str:
+    real_response = solution["response"]
+    if "<pre" not in real_response:
+        return real_response
+
+    soup = parse_html(real_response)
+    json_body = soup.select_one("pre")
+
+    if json_body is not None:
+        return json_body.get_text()
+    return real_response
+
+
+# keeps browsers open between requests so that challenges already solved by a
+# session do not have to be solved again
+class FlareSolverrPool:
+    def __init__(
+        self,
+        flaresolverr_url: str,
+        *,
+        size: int = 2,
+        max_timeout: int = FLARESOLVERR_TIMEOUT,
+    ) -> None:
+        self.flaresolverr_url = flaresolverr_url
+        self.size = size
+        self.max_timeout = max_timeout
+        self.__sessions: list[str] = []
+        self.__idle: list[str] = []
+        self.__n_sessions = 0
+        # notified whenever a session is returned or a slot is freed, so that
+        # callers waiting on a full pool can reuse the first or fill the second
+        self.__changed = Condition()
+
+    def __can_acquire(self) -> bool:
+        return len(self.__idle) != 0 or self.__n_sessions < self.size
+
+    async def __acquire(self, session: aiohttp.ClientSession) -> str:
+        async with self.__changed:
+            await self.__changed.wait_for(self.__can_acquire)
+            if len(self.__idle) != 0:
+                return self.__idle.pop()
+            # counted before creating it so that concurrent callers do not
+            # create more sessions than the pool allows
+            self.__n_sessions += 1
+
+        try:
+            result = await flaresolverr_command(
+                session, self.flaresolverr_url, {"cmd": "sessions.create"}
+            )
+            session_id = str(result["session"])
+        except BaseException as e:
+            async with self.__changed:
+                self.__n_sessions -= 1
+                self.__changed.notify()
+            raise e
+
+        self.__sessions.append(session_id)
+        return session_id
+
+    async def __release(
+        self, session: aiohttp.ClientSession, session_id: str, healthy: bool
+    ) -> None:
+        async with self.__changed:
+            # sessions of a closed pool are already destroyed
+            if session_id not in self.__sessions:
+                return
+            if healthy:
+                self.__idle.append(session_id)
+                self.__changed.notify()
+                return
+            self.__sessions.remove(session_id)
+
+        # the session may be the reason it failed, its browser is closed and a
+        # new one may then replace it
+        try:
+            await self.__destroy(session, session_id)
+        finally:
+            async with self.__changed:
+                self.__n_sessions -= 1
+                self.__changed.notify()
+
+    async def __destroy(self, session: aiohttp.ClientSession, session_id: str) -> None:
+        # flaresolverr may already be gone, its sessions with it
+        with suppress(aiohttp.ClientError):
+            await flaresolverr_command(
+                session,
+                self.flaresolverr_url,
+                {"cmd": "sessions.destroy", "session": session_id},
+            )
+
+    @asynccontextmanager
+    async def session_id(self, session: aiohttp.ClientSession) -> AsyncIterator[str]:
+        session_id = await self.__acquire(session)
+
+        healthy = True
+        try:
+            yield session_id
+        except Exception as e:
+            healthy = False
+            raise e
+        finally:
+            await self.__release(session, session_id, healthy)
+
+    async def solve(self, session: aiohttp.ClientSession, url: str) -> dict[str, Any]:
+        async with self.session_id(session) as session_id:
+            result = await flaresolverr_command(
+                session,
+                self.flaresolverr_url,
+                {
+                    "cmd": "request.get",
+                    "url": url,
+                    "session": session_id,
+                    "maxTimeout": self.max_timeout,
+                },
+            )
+
+            if result.get("status") != "ok" or "solution" not in result:
+                raise LibgenFlareSolverrException(url)
+
+        return result["solution"]
+
+    async def close(self, session: aiohttp.ClientSession) -> None:
+        async with self.__changed:
+            sessions, self.__sessions = self.__sessions, []
+            self.__idle = []
+            # sessions still being created or destroyed free their own slot
+            self.__n_sessions -= len(sessions)
+            self.__changed.notify_all()
+
+        for session_id in sessions:
+            await self.__destroy(session, session_id)
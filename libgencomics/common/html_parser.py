@@ -0,0 +1,36 @@
+from asyncio import get_running_loop
+from collections.abc import Callable
+from concurrent.futures import Executor
+
+from bs4 import BeautifulSoup
+
+# search pages and flaresolverr wrappers are parsed with lxml when it is
+# installed, the stdlib parser is always there to fall back on
+try:
+    import lxml  # noqa: F401
+
+    BACKEND = "lxml"
+
+except ImportError:
+    BACKEND = "html.parser"
+
+# smaller pages are parsed faster than a thread can be handed the work
+OFF_LOOP_THRESHOLD = 64 * 1024
+
+
+def parse_html(markup: str) -> BeautifulSoup:
+    return BeautifulSoup(markup, BACKEND)
+
+
+# runs func on a worker so that parsing a large page does not stall every other
+# request in flight. a process pool only works with a picklable func returning
+# plain data, not a soup
+async def parse_off_loop[T](
+    func: Callable[[str], T],
+    markup: str,
+    executor: Executor | None = None,
+) -> T:
+    if len(markup) < OFF_LOOP_THRESHOLD:
+        return func(markup)
+
+    return await get_running_loop().run_in_executor(executor, func, markup)
@@ -0,0 +1,42 @@
+import json
+from typing import Any
+
+# the decoded object of a single id in a json.php response
+type Payload = dict[str, Any]
+
+# json.php responses are decoded with the fastest library installed, the
+# stdlib is always there to fall back on
+try:
+    import orjson
+
+    BACKEND = "orjson"
+
+    def loads(data: str | bytes) -> Any:
+        return orjson.loads(data)
+
+    def dumps(obj: Any) -> str:
+        return orjson.dumps(obj).decode()
+
+except ImportError:
+    try:
+        import msgspec
+
+        BACKEND = "msgspec"
+
+        decoder = msgspec.json.Decoder()
+        encoder = msgspec.json.Encoder()
+
+        def loads(data: str | bytes) -> Any:
+            return decoder.decode(data)
+
+        def dumps(obj: Any) -> str:
+            return encoder.encode(obj).decode()
+
+    except ImportError:
+        BACKEND = "json"
+
+        def loads(data: str | bytes) -> Any:
+            return json.loads(data)
+
+        def dumps(obj: Any) -> str:
+            return json.dumps(obj, separators=(",", ":"))
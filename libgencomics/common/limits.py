@@ -0,0 +1,39 @@
+from asyncio import Semaphore
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from urllib.parse import urlsplit
+
+
+@dataclass
+class FetchLimits:
+    max_connections: int = 32
+    max_connections_per_host: int = 8
+    # seconds resolved hosts and idle connections are kept around for reuse
+    dns_cache_ttl: int = 300
+    keepalive_timeout: float = 30.0
+    # browsers kept open by each flaresolverr instance
+    flaresolverr_sessions: int = 2
+
+
+class ConcurrencyLimiter:
+    def __init__(self, limits: FetchLimits) -> None:
+        self.limits = limits
+        self.__global = Semaphore(limits.max_connections)
+        self.__hosts: dict[str, Semaphore] = {}
+
+    def __host_semaphore(self, url: str) -> Semaphore:
+        host = urlsplit(url).netloc
+
+        if host not in self.__hosts:
+            self.__hosts[host] = Semaphore(self.limits.max_connections_per_host)
+
+        return self.__hosts[host]
+
+    # waits for a free slot on the host before taking a global one so that a
+    # busy host never holds global slots other hosts could use
+    @asynccontextmanager
+    async def slot(self, url: str) -> AsyncIterator[None]:
+        async with self.__host_semaphore(url):
+            async with self.__global:
+                yield
@@ -0,0 +1,182 @@
+from collections import defaultdict
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from time import perf_counter
+from urllib.parse import urlsplit
+
+from libgencomics.errors import LibgenException
+
+REQUEST_SECONDS_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+# receives every event of the fetch pipeline, does nothing by default so that
+# callers can override only the callbacks they care about
+class MetricsCollector:
+    def on_request(self, url: str, seconds: float, size: int) -> None:
+        pass
+
+    def on_retry(self, url: str, exception: Exception) -> None:
+        pass
+
+    def on_flaresolverr(self, url: str, seconds: float) -> None:
+        pass
+
+    def on_check(self, url: str, seconds: float) -> None:
+        pass
+
+    def on_parse(self, object_type: str, seconds: float) -> None:
+        pass
+
+    def on_phase(self, phase: str, seconds: float) -> None:
+        pass
+
+    @contextmanager
+    def phase(self, phase: str) -> Iterator[None]:
+        start = perf_counter()
+        try:
+            yield
+        finally:
+            self.on_phase(phase, perf_counter() - start)
+
+
+@dataclass
+class Summary:
+    count: int = 0
+    sum: float = 0.0
+
+    def observe(self, value: float) -> None:
+        self.count += 1
+        self.sum += value
+
+
+@dataclass
+class Histogram(Summary):
+    buckets: list[int] = field(
+        default_factory=lambda: [0] * len(REQUEST_SECONDS_BUCKETS)
+    )
+
+    def observe(self, value: float) -> None:
+        super().observe(value)
+        for index, bound in enumerate(REQUEST_SECONDS_BUCKETS):
+            if value <= bound:
+                self.buckets[index] += 1
+
+
+def host_of(url: str) -> str:
+    return urlsplit(url).netloc or url
+
+
+def escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def format_labels(labels: dict[str, str]) -> str:
+    if len(labels) == 0:
+        return ""
+    return (
+        "{"
+        + ",".join(f'{key}="{escape_label(value)}"' for key, value in labels.items())
+        + "}"
+    )
+
+
+class InMemoryMetrics(MetricsCollector):
+    def __init__(self) -> None:
+        self.requests: defaultdict[str, Histogram] = defaultdict(Histogram)
+        self.response_bytes: defaultdict[str, int] = defaultdict(int)
+        self.retries: defaultdict[tuple[str, str], int] = defaultdict(int)
+        self.flaresolverr: defaultdict[str, Summary] = defaultdict(Summary)
+        self.checks = Summary()
+        self.parses: defaultdict[str, Summary] = defaultdict(Summary)
+        self.phases: defaultdict[str, Summary] = defaultdict(Summary)
+
+    def on_request(self, url: str, seconds: float, size: int) -> None:
+        host = host_of(url)
+        self.requests[host].observe(seconds)
+        self.response_bytes[host] += size
+
+    def on_retry(self, url: str, exception: Exception) -> None:
+        # client errors and timeouts are retried too
+        name = (
+            exception.name
+            if isinstance(exception, LibgenException)
+            else type(exception).__name__
+        )
+        self.retries[(host_of(url), name)] += 1
+
+    def on_flaresolverr(self, url: str, seconds: float) -> None:
+        self.flaresolverr[host_of(url)].observe(seconds)
+
+    def on_check(self, url: str, seconds: float) -> None:
+        self.checks.observe(seconds)
+
+    def on_parse(self, object_type: str, seconds: float) -> None:
+        self.parses[object_type].observe(seconds)
+
+    def on_phase(self, phase: str, seconds: float) -> None:
+        self.phases[phase].observe(seconds)
+
+    # prometheus text exposition format
+    def to_prometheus(self, prefix: str = "libgencomics") -> str:
+        lines: list[str] = []
+
+        def summary(
+            name: str, help: str, summaries: dict[tuple[str, str], Summary]
+        ) -> None:
+            lines.append(f"# HELP {prefix}_{name} {help}")
+            lines.append(f"# TYPE {prefix}_{name} summary")
+            for (label, value), observed in summaries.items():
+                labels = format_labels({label: value} if label else {})
+                lines.append(f"{prefix}_{name}_sum{labels} {observed.sum}")
+                lines.append(f"{prefix}_{name}_count{labels} {observed.count}")
+
+        lines.append(f"# HELP {prefix}_request_seconds Latency of libgen requests")
+        lines.append(f"# TYPE {prefix}_request_seconds histogram")
+        for host, histogram in self.requests.items():
+            for index, bound in enumerate(REQUEST_SECONDS_BUCKETS):
+                labels = format_labels({"host": host, "le": str(bound)})
+                lines.append(
+                    f"{prefix}_request_seconds_bucket{labels} "
+                    f"{histogram.buckets[index]}"
+                )
+            labels = format_labels({"host": host, "le": "+Inf"})
+            lines.append(f"{prefix}_request_seconds_bucket{labels} {histogram.count}")
+            labels = format_labels({"host": host})
+            lines.append(f"{prefix}_request_seconds_sum{labels} {histogram.sum}")
+            lines.append(f"{prefix}_request_seconds_count{labels} {histogram.count}")
+
+        lines.append(f"# HELP {prefix}_response_bytes_total Size of libgen responses")
+        lines.append(f"# TYPE {prefix}_response_bytes_total counter")
+        for host, size in self.response_bytes.items():
+            labels = format_labels({"host": host})
+            lines.append(f"{prefix}_response_bytes_total{labels} {size}")
+
+        lines.append(f"# HELP {prefix}_retries_total Retries by triggering exception")
+        lines.append(f"# TYPE {prefix}_retries_total counter")
+        for (host, exception), count in self.retries.items():
+            labels = format_labels({"host": host, "exception": exception})
+            lines.append(f"{prefix}_retries_total{labels} {count}")
+
+        summary(
+            "flaresolverr_seconds",
+            "Requests which fell back to FlareSolverr",
+            {("host", host): observed for host, observed in self.flaresolverr.items()},
+        )
+        summary(
+            "check_seconds",
+            "Time spent classifying responses",
+            {("", ""): self.checks},
+        )
+        summary(
+            "parse_seconds",
+            "Time spent building objects from their json",
+            {("object", name): observed for name, observed in self.parses.items()},
+        )
+        summary(
+            "phase_seconds",
+            "Time spent in each search phase",
+            {("phase", name): observed for name, observed in self.phases.items()},
+        )
+
+        return "\n".join(lines) + "\n"
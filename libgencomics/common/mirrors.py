@@ -0,0 +1,93 @@
+from dataclasses import dataclass
+from time import monotonic
+
+from libgencomics.errors import (
+    LibgenBadGatewayException,
+    LibgenSSLHandshakeFailedException,
+    LibgenTimeoutException,
+)
+
+# responses which mean the mirror itself is unhealthy
+MIRROR_FAILURE_EXCEPTIONS = (
+    LibgenBadGatewayException,
+    LibgenSSLHandshakeFailedException,
+    LibgenTimeoutException,
+)
+
+
+@dataclass
+class MirrorStats:
+    # exponentially weighted moving averages, in seconds and failures per request
+    latency: float | None = None
+    error_rate: float = 0.0
+    last_failure: float | None = None
+
+
+# mirrors serving the same objects as a canonical site, requests for the
+# canonical site are sent to whichever of them is the fastest and healthy
+class MirrorPool:
+    def __init__(
+        self,
+        canonical_site_url: str,
+        mirrors: list[str],
+        *,
+        hedge_after: float | None = None,
+        smoothing: float = 0.2,
+        max_error_rate: float = 0.5,
+        failure_cooldown: float = 30.0,
+    ) -> None:
+        self.canonical_site_url = canonical_site_url.rstrip("/")
+        self.mirrors = list(
+            dict.fromkeys(
+                [self.canonical_site_url, *(mirror.rstrip("/") for mirror in mirrors)]
+            )
+        )
+        # seconds after which a second request is sent to another mirror
+        self.hedge_after = hedge_after
+        self.smoothing = smoothing
+        self.max_error_rate = max_error_rate
+        # seconds during which a mirror which just failed is not retried first
+        self.failure_cooldown = failure_cooldown
+        self.stats = {mirror: MirrorStats() for mirror in self.mirrors}
+
+    def serves(self, url: str) -> bool:
+        return url.startswith(self.canonical_site_url + "/")
+
+    def rewrite(self, url: str, mirror: str) -> str:
+        return mirror + url[len(self.canonical_site_url) :]
+
+    def is_healthy(self, mirror: str) -> bool:
+        stats = self.stats[mirror]
+
+        if stats.error_rate <= self.max_error_rate:
+            return True
+
+        # let it prove itself again once it had some rest
+        return (
+            stats.last_failure is None
+            or monotonic() - stats.last_failure > self.failure_cooldown
+        )
+
+    # healthy mirrors first, mirrors never tried before them since they could
+    # be the fastest, then by latency weighed by how often they fail
+    def ranked(self) -> list[str]:
+        def score(mirror: str) -> tuple[bool, float]:
+            stats = self.stats[mirror]
+            latency = 0.0 if stats.latency is None else stats.latency
+            return (not self.is_healthy(mirror), latency * (1 + stats.error_rate))
+
+        return sorted(self.mirrors, key=score)
+
+    def on_success(self, mirror: str, seconds: float) -> None:
+        stats = self.stats[mirror]
+        stats.latency = (
+            seconds
+            if stats.latency is None
+            else stats.latency + self.smoothing * (seconds - stats.latency)
+        )
+        stats.error_rate -= self.smoothing * stats.error_rate
+
+    def on_failure(self, mirror: str) -> None:
+        stats = self.stats[mirror]
+        stats.error_rate += self.smoothing * (1 - stats.error_rate)
+        stats.last_failure = monotonic()
@@ -0,0 +1,116 @@
+from asyncio import sleep
+from dataclasses import dataclass
+from time import monotonic
+from urllib.parse import urlsplit
+
+from libgencomics.errors import (
+    LibgenException,
+    LibgenMaxUserConnectionsException,
+    LibgenNginxRateLimitedException,
+    LibgenRateLimitedException,
+)
+
+RATE_LIMIT_EXCEPTIONS = (
+    LibgenMaxUserConnectionsException,
+    LibgenNginxRateLimitedException,
+    LibgenRateLimitedException,
+)
+
+
+@dataclass
+class RateLimits:
+    # all rates are in requests per second
+    initial_rate: float = 8.0
+    min_rate: float = 0.25
+    max_rate: float = 64.0
+    # rate gained over one second of successful requests
+    additive_increase: float = 1.0
+    multiplicative_decrease: float = 0.5
+    # seconds during which further rate limit errors do not lower the rate,
+    # requests already in flight when the first one came back will fail too
+    decrease_cooldown: float = 2.0
+    # seconds worth of requests which can be sent at once
+    burst: float = 1.0
+
+
+class HostRate:
+    def __init__(self, limits: RateLimits) -> None:
+        self.limits = limits
+        self.rate = limits.initial_rate
+        self.tokens = 1.0
+        self.updated = monotonic()
+        self.last_decrease: float | None = None
+
+    def __refill(self) -> None:
+        now = monotonic()
+        capacity = max(1.0, self.rate * self.limits.burst)
+        self.tokens = min(capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    # takes a token if there is one, otherwise returns how long it takes for
+    # the next one to come at the current rate
+    def try_take(self) -> float:
+        self.__refill()
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0
+        return (1 - self.tokens) / self.rate
+
+    def increase(self) -> None:
+        self.__refill()
+        self.rate = min(
+            self.limits.max_rate,
+            self.rate + self.limits.additive_increase / self.rate,
+        )
+
+    def decrease(self) -> None:
+        now = monotonic()
+        if (
+            self.last_decrease is not None
+            and now - self.last_decrease < self.limits.decrease_cooldown
+        ):
+            return
+
+        self.__refill()
+        self.last_decrease = now
+        self.rate = max(
+            self.limits.min_rate,
+            self.rate * self.limits.multiplicative_decrease,
+        )
+        # drop the saved up burst so the host gets a break right away
+        self.tokens = min(self.tokens, 0)
+
+
+class RateController:
+    def __init__(self, limits: RateLimits | None = None) -> None:
+        self.limits = limits or RateLimits()
+        self.__hosts: dict[str, HostRate] = {}
+
+    def __host(self, url: str) -> HostRate:
+        host = urlsplit(url).netloc or url
+
+        if host not in self.__hosts:
+            self.__hosts[host] = HostRate(self.limits)
+
+        return self.__hosts[host]
+
+    # the wait is checked again after every sleep, so that a rate lowered or
+    # raised in the meantime applies to requests which are already waiting
+    async def acquire(self, url: str) -> None:
+        host_rate = self.__host(url)
+        while (delay := host_rate.try_take()) > 0:
+            await sleep(delay)
+
+    def on_success(self, url: str) -> None:
+        self.__host(url).increase()
+
+    def on_error(self, url: str, exception: LibgenException) -> None:
+        if isinstance(exception, RATE_LIMIT_EXCEPTIONS):
+            self.__host(url).decrease()
+
+    # accepts either a host or any url on that host
+    def current_rate(self, url: str) -> float:
+        return self.__host(url).rate
+
+    def rates(self) -> dict[str, float]:
+        return {host: host_rate.rate for host, host_rate in self.__hosts.items()}
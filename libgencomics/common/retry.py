@@ -0,0 +1,15 @@
+from dataclasses import dataclass
+from random import uniform
+
+
+@dataclass
+class RetryPolicy:
+    # attempts made for a single url before giving up on it
+    max_attempts: int = 8
+    # seconds, doubled after every failed attempt
+    base_delay: float = 0.5
+    max_delay: float = 30.0
+
+    # full jitter, so that urls which failed together are not retried together
+    def delay(self, attempt: int) -> float:
+        return uniform(0, min(self.max_delay, self.base_delay * 2 ** (attempt - 1)))
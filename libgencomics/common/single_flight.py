@@ -0,0 +1,49 @@
+from asyncio import Future, get_running_loop, wait
+from collections.abc import Awaitable, Callable
+
+
+# lets concurrent callers share the result of a single in-flight operation
+class SingleFlight[K, V]:
+    def __init__(self) -> None:
+        self.__calls: dict[K, Future[V]] = {}
+
+    def get(self, key: K) -> Future[V] | None:
+        return self.__calls.get(key)
+
+    def claim(self, key: K) -> Future[V]:
+        future: Future[V] = get_running_loop().create_future()
+        self.__calls[key] = future
+        return future
+
+    def resolve(self, key: K, value: V) -> None:
+        future = self.__calls.pop(key, None)
+        if future is not None and not future.done():
+            future.set_result(value)
+
+    # waiters see a cancelled future and have to do the work themselves
+    def abandon(self, key: K) -> None:
+        future = self.__calls.pop(key, None)
+        if future is not None and not future.done():
+            future.cancel()
+
+    # the first caller for a key runs func, the others wait for its result,
+    # or run it themselves if it failed
+    async def run(self, key: K, func: Callable[[], Awaitable[V]]) -> V:
+        while (future := self.get(key)) is not None:
+            await wait([future])
+            if not future.cancelled():
+                return future.result()
+
+        self.claim(key)
+
+        try:
+            value = await func()
+        except BaseException as e:
+            self.abandon(key)
+            raise e
+
+        self.resolve(key, value)
+        return value
+
+    def __len__(self) -> int:
+        return len(self.__calls)
@@ -9,6 +9,10 @@ class LibgenBadGatewayException(LibgenException):
     name = "LibgenBadGatewayException"
 
 
+class LibgenFlareSolverrException(LibgenException):
+    name = "LibgenFlareSolverrException"
+
+
 class LibgenMaxUserConnectionsException(LibgenException):
     name = "LibgenMaxUserConnectionsException"
 
@@ -29,6 +33,10 @@ class LibgenRequestURITooLargeException(LibgenException):
     name = "LibgenRequestURITooLargeException"
 
 
+class LibgenRetriesExhaustedException(LibgenException):
+    name = "LibgenRetriesExhaustedException"
+
+
 class LibgenSSLHandshakeFailedException(LibgenException):
     name = "LibgenSSLHandshakeFailedException"
 
@@ -0,0 +1,8 @@
+from .columns import get_columns as get_columns
+from .columns import get_row_getter as get_row_getter
+from .exporters import ArrowExporter as ArrowExporter
+from .exporters import CSVExporter as CSVExporter
+from .exporters import Exporter as Exporter
+from .exporters import NDJSONExporter as NDJSONExporter
+from .exporters import export as export
+from .exporters import open_exporter as open_exporter
@@ -0,0 +1,104 @@
+from collections.abc import Callable
+from datetime import datetime
+from operator import attrgetter
+from types import NoneType
+from typing import Any, get_args, get_type_hints
+
+from libgencomics.libgen_objects import Edition, ResultFile, Series
+
+type Row = tuple[Any, ...]
+
+# edition numbers can be ranges, they are split in two columns
+EDITION_ATTRIBUTES = tuple(
+    attr for attr in Edition.JSON_ATTRIBUTES if attr != "number"
+) + ("number", "number_end")
+
+
+def scalar_type(hint: Any) -> type:
+    args = [arg for arg in get_args(hint) if arg is not NoneType] or [hint]
+
+    for scalar in [bool, int, float, datetime]:
+        if scalar in args:
+            return scalar
+
+    return str
+
+
+def object_columns(
+    object_type: type[Series | Edition | ResultFile], prefix: str = ""
+) -> dict[str, type]:
+    hints = get_type_hints(object_type)
+    attributes = (
+        EDITION_ATTRIBUTES if object_type is Edition else object_type.JSON_ATTRIBUTES
+    )
+
+    return {
+        prefix + attr: float if attr == "number_end" else scalar_type(hints[attr])
+        for attr in attributes
+    }
+
+
+# files carry the columns of their edition and series, editions the ones of
+# their series
+def get_columns(object_type: type[Series | Edition | ResultFile]) -> dict[str, type]:
+    columns = object_columns(object_type)
+
+    if object_type is ResultFile:
+        columns |= object_columns(Edition, "edition_")
+    if object_type is not Series:
+        columns |= object_columns(Series, "series_")
+
+    return columns
+
+
+def split_number(
+    number: float | tuple[float, float] | None,
+) -> tuple[float | None, float | None]:
+    if isinstance(number, tuple):
+        return number
+    return number, number
+
+
+def series_row_getter() -> Callable[[Series | None], Row]:
+    get = attrgetter(*Series.JSON_ATTRIBUTES)
+    empty = (None,) * len(Series.JSON_ATTRIBUTES)
+
+    def series_row(series: Series | None) -> Row:
+        return empty if series is None else get(series)
+
+    return series_row
+
+
+def edition_row_getter() -> Callable[[Edition | None], Row]:
+    get = attrgetter(*EDITION_ATTRIBUTES[:-2])
+    series_row = series_row_getter()
+    empty = (None,) * len(EDITION_ATTRIBUTES) + series_row(None)
+
+    def edition_row(edition: Edition | None) -> Row:
+        if edition is None:
+            return empty
+        return (
+            *get(edition),
+            *split_number(edition.number),
+            *series_row(edition.series),
+        )
+
+    return edition_row
+
+
+# the values of get_columns(object_type) for an object, in the same order
+def get_row_getter(
+    object_type: type[Series | Edition | ResultFile],
+) -> Callable[[Any], Row]:
+    if object_type is Series:
+        return series_row_getter()
+    if object_type is Edition:
+        return edition_row_getter()
+
+    get = attrgetter(*ResultFile.JSON_ATTRIBUTES)
+    edition_row = edition_row_getter()
+
+    def file_row(file: ResultFile) -> Row:
+        return (*get(file), *edition_row(file.issue))
+
+    return file_row
@@ -0,0 +1,229 @@
+import csv
+from collections.abc import AsyncIterable, Iterable
+from datetime import datetime
+from functools import lru_cache
+from itertools import batched
+from pathlib import Path
+from types import TracebackType
+from typing import Any, TextIO
+
+from libgencomics.common import json_codec
+from libgencomics.libgen_objects import Edition, ResultFile, Series
+
+from .columns import Row, get_columns, get_row_getter
+
+# arrow and parquet files can only be written with pyarrow installed
+try:
+    import pyarrow
+    import pyarrow.ipc
+    import pyarrow.parquet
+
+    ARROW_TYPES: dict[type, Any] = {
+        bool: pyarrow.bool_(),
+        int: pyarrow.int64(),
+        float: pyarrow.float64(),
+        datetime: pyarrow.timestamp("us"),
+        str: pyarrow.string(),
+    }
+
+except ImportError:
+    pyarrow = None
+    ARROW_TYPES = {}
+
+FORMATS = {
+    ".ndjson": "ndjson",
+    ".jsonl": "ndjson",
+    ".csv": "csv",
+    ".parquet": "parquet",
+    ".arrow": "arrow",
+    ".feather": "arrow",
+}
+
+# objects given to write_many are flattened this many at a time
+CHUNK_SIZE = 4096
+
+
+# objects are flattened to rows of get_columns(object_type) and written as they
+# come, nothing but the current batch is kept in memory
+class Exporter[T: (Series, Edition, ResultFile)]:
+    def __init__(self, object_type: type[T]) -> None:
+        self.object_type = object_type
+        self.columns = get_columns(object_type)
+        self.n_written = 0
+        self.__get_row = get_row_getter(object_type)
+        self.__datetimes = [
+            i
+            for i, column_type in enumerate(self.columns.values())
+            if column_type is datetime
+        ]
+        self.__format_datetime = lru_cache(maxsize=4096)(str)
+
+    def write_rows(self, rows: list[Row]) -> None:
+        raise NotImplementedError()
+
+    # datetimes are written the same way as by __json__, most objects of a
+    # batch share the same few
+    def text_row(self, row: Row) -> list[Any]:
+        values = list(row)
+        for i in self.__datetimes:
+            if (value := values[i]) is not None:
+                values[i] = self.__format_datetime(value)
+        return values
+
+    def write(self, obj: T) -> None:
+        self.write_many([obj])
+
+    def write_many(self, objs: Iterable[T]) -> None:
+        for chunk in batched(objs, CHUNK_SIZE):
+            rows = [self.__get_row(obj) for obj in chunk]
+            self.write_rows(rows)
+            self.n_written += len(rows)
+
+    async def write_stream(self, objs: AsyncIterable[T]) -> None:
+        async for obj in objs:
+            self.write(obj)
+
+    def close(self) -> None:
+        pass
+
+    def __enter__(self) -> "Exporter[T]":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.close()
+
+
+class NDJSONExporter[T: (Series, Edition, ResultFile)](Exporter[T]):
+    def __init__(
+        self, output: TextIO, object_type: type[T], *, close_output: bool = False
+    ) -> None:
+        Exporter.__init__(self, object_type)
+        self.output = output
+        self.close_output = close_output
+        self.__names = list(self.columns)
+
+    def write_rows(self, rows: list[Row]) -> None:
+        lines = [
+            json_codec.dumps(dict(zip(self.__names, self.text_row(row))))
+            for row in rows
+        ]
+
+        if len(lines) != 0:
+            self.output.write("\n".join(lines) + "\n")
+
+    def close(self) -> None:
+        if self.close_output:
+            self.output.close()
+
+
+class CSVExporter[T: (Series, Edition, ResultFile)](Exporter[T]):
+    def __init__(
+        self, output: TextIO, object_type: type[T], *, close_output: bool = False
+    ) -> None:
+        Exporter.__init__(self, object_type)
+        self.output = output
+        self.close_output = close_output
+        self.__writer = csv.writer(output)
+        self.__writer.writerow(self.columns)
+
+    def write_rows(self, rows: list[Row]) -> None:
+        self.__writer.writerows(self.text_row(row) for row in rows)
+
+    def close(self) -> None:
+        if self.close_output:
+            self.output.close()
+
+
+# rows are buffered into record batches of batch_size, format is either
+# "parquet" or "arrow" for the arrow ipc file format
+class ArrowExporter[T: (Series, Edition, ResultFile)](Exporter[T]):
+    def __init__(
+        self,
+        path: Path | str,
+        object_type: type[T],
+        *,
+        format: str = "parquet",
+        batch_size: int = 65536,
+    ) -> None:
+        if pyarrow is None:
+            raise ImportError("pyarrow is needed to export to arrow or parquet")
+
+        Exporter.__init__(self, object_type)
+        self.batch_size = batch_size
+        self.schema = pyarrow.schema(
+            [
+                (column, ARROW_TYPES[column_type])
+                for column, column_type in self.columns.items()
+            ]
+        )
+        self.__rows: list[Row] = []
+
+        if format == "parquet":
+            self.__writer = pyarrow.parquet.ParquetWriter(path, self.schema)
+        elif format == "arrow":
+            self.__writer = pyarrow.ipc.new_file(path, self.schema)
+        else:
+            raise ValueError(f"unknown arrow format {format}")
+
+    def write_rows(self, rows: list[Row]) -> None:
+        self.__rows.extend(rows)
+
+        if len(self.__rows) >= self.batch_size:
+            self.flush()
+
+    def flush(self) -> None:
+        if len(self.__rows) == 0 or pyarrow is None:
+            return
+
+        arrays = [
+            pyarrow.array(values, type=column_type)
+            for values, column_type in zip(
+                zip(*self.__rows), self.schema.types, strict=True
+            )
+        ]
+        self.__writer.write_batch(
+            pyarrow.RecordBatch.from_arrays(arrays, schema=self.schema)
+        )
+        self.__rows = []
+
+    def close(self) -> None:
+        self.flush()
+        self.__writer.close()
+
+
+# picks the exporter from the suffix of path unless a format is given
+def open_exporter[T: (Series, Edition, ResultFile)](
+    path: Path | str, object_type: type[T], format: str | None = None
+) -> Exporter[T]:
+    format = format or FORMATS.get(Path(path).suffix.lower())
+
+    if format == "ndjson":
+        return NDJSONExporter(
+            open(path, "w", encoding="utf-8"), object_type, close_output=True
+        )
+    elif format == "csv":
+        return CSVExporter(
+            open(path, "w", encoding="utf-8", newline=""),
+            object_type,
+            close_output=True,
+        )
+    elif format in ["parquet", "arrow"]:
+        return ArrowExporter(path, object_type, format=format)
+
+    raise ValueError(f"cannot tell which format to export {path} to")
+
+
+def export[T: (Series, Edition, ResultFile)](
+    objs: Iterable[T],
+    path: Path | str,
+    object_type: type[T],
+    format: str | None = None,
+) -> int:
+    with open_exporter(path, object_type, format) as exporter:
+        exporter.write_many(objs)
+        return exporter.n_written
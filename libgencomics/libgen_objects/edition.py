@@ -1,14 +1,20 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Any
+from typing import Any, ClassVar
 
-from libgencomics.common import CONSTANTS, parse_value
+from libgencomics.common import (
+    CONSTANTS,
+    FetchEngine,
+    Payload,
+    interned,
+    parse_value,
+)
 
 from .libgen_object import LibgenObject
 from .series import Series
 
 
-@dataclass
+@dataclass(slots=True)
 class Edition(LibgenObject):
     series: Series
 
@@ -25,6 +31,24 @@ class Edition(LibgenObject):
     time_added: datetime | None
     time_last_modified: datetime | None
 
+    file_ids: list[str] = field(default_factory=list)
+
+    # attributes included when serialized
+    JSON_ATTRIBUTES: ClassVar[tuple[str, ...]] = (
+        "author",
+        "cover_url",
+        "day",
+        "id",
+        "month",
+        "number",
+        "pages",
+        "publisher",
+        "time_added",
+        "time_last_modified",
+        "title",
+        "year",
+    )
+
     def __parse_number(
         self, edition_results: Any
     ) -> float | tuple[float, float] | None:
@@ -56,15 +80,17 @@ class Edition(LibgenObject):
         id: int,
         libgen_site_url: str,
         series: Series,
-        response: str | None = None,
+        response: str | Payload | None = None,
+        keep_json: bool = False,
     ):
-        super().__init__(
+        LibgenObject.__init__(
+            self,
             id=id,
             url=libgen_site_url + CONSTANTS.EDITION_REQUEST,
             response=response,
         )
 
-        edition_results = list(self.json_obj.values())[0]
+        edition_results = self.json_obj or {}
 
         self.series = series
 
@@ -72,7 +98,7 @@ class Edition(LibgenObject):
 
         self.title = parse_value(edition_results, "title", str)
         self.author = parse_value(edition_results, "author", str)
-        self.publisher = parse_value(edition_results, "publisher", str)
+        self.publisher = parse_value(edition_results, "publisher", interned)
         self.cover_url = parse_value(edition_results, "cover_url", str)
 
         self.year = parse_value(edition_results, "year", int)
@@ -93,20 +119,39 @@ class Edition(LibgenObject):
             datetime.fromisoformat,
         )
 
-    def __json__(self) -> dict[str, str | int | None]:
-        return super().__to_json__(
-            [
-                "author",
-                "cover_url",
-                "day",
-                "id",
-                "month",
-                "number",
-                "pages",
-                "publisher",
-                "time_added",
-                "time_last_modified",
-                "title",
-                "year",
-            ]
+        files = edition_results.get("files")
+        self.file_ids = (
+            [str(result_file["f_id"]) for result_file in files.values()]
+            if isinstance(files, dict)
+            else []
+        )
+
+        if not keep_json:
+            self.json_obj = None
+
+    @classmethod
+    async def fetch(
+        cls,
+        *,
+        id: int,
+        libgen_site_url: str,
+        series: Series,
+        flaresolverr_url: str | None = None,
+        engine: FetchEngine | None = None,
+        keep_json: bool = False,
+    ) -> "Edition":
+        return cls(
+            id=id,
+            libgen_site_url=libgen_site_url,
+            series=series,
+            keep_json=keep_json,
+            response=await cls.fetch_response(
+                libgen_site_url + CONSTANTS.EDITION_REQUEST,
+                id,
+                flaresolverr_url,
+                engine,
+            ),
         )
+
+    def __json__(self) -> dict[str, str | int | None]:
+        return self.__to_json__(self.JSON_ATTRIBUTES)
@@ -1,44 +1,75 @@
 import json
+from collections.abc import Sequence
 from dataclasses import dataclass
 from typing import Any
 
-from libgencomics.common import attempt_request, check_response_error
+from libgencomics.common import (
+    FetchEngine,
+    Payload,
+    attempt_request,
+    check_response_error,
+    fetch_multiple_urls,
+    json_codec,
+)
 
 
-@dataclass
+# slotted dataclasses are rebuilt by the decorator, which breaks zero-argument
+# super(), so subclasses call the methods of their parent explicitly
+@dataclass(slots=True)
 class LibgenObject:
     id: int
-    libgen_item_url: str
-    json_obj: Any
+    request_url: str
+    # the decoded object, only kept when asked for with keep_json
+    json_obj: dict[str, Any] | None
 
     def __init__(
         self,
         *,
         id: int,
         url: str,
-        response: str | None = None,
+        response: str | Payload | None = None,
     ):
         self.id = id
-        self.libgen_item_url = f"{url}{self.id}"
-
-        # Checking the passed response is the responsibility of the caller
-        _response = (
-            response
-            or check_response_error(
-                self.libgen_item_url, attempt_request(self.libgen_item_url)
-            )[0]
+        self.request_url = url
+
+        # the payload of this id, already decoded from a batched response
+        if isinstance(response, dict):
+            self.json_obj = response
+            return
+
+        # Checking the passed response is the responsibility of the caller.
+        # Without one, the object is fetched with a blocking request, use the
+        # async fetch classmethods from within an event loop instead.
+        _response = response or check_response_error(
+            self.libgen_item_url, attempt_request(self.libgen_item_url)
         )
 
         try:
-            self.json_obj = json.loads(_response)
+            self.json_obj = list(json_codec.loads(_response).values())[0]
         except Exception as e:
             print(_response)
             raise e
 
+    @property
+    def libgen_item_url(self) -> str:
+        return f"{self.request_url}{self.id}"
+
+    @staticmethod
+    async def fetch_response(
+        url: str,
+        id: int,
+        flaresolverr_url: str | None = None,
+        engine: FetchEngine | None = None,
+    ) -> str:
+        responses = await fetch_multiple_urls([f"{url}{id}"], flaresolverr_url, engine)
+        return responses[0]
+
     def get(self, key: str) -> Any:
-        return list(self.json_obj.values())[0][key]
+        if self.json_obj is None:
+            raise ValueError(f"{self.libgen_item_url} was parsed without keep_json")
+        return self.json_obj[key]
 
-    def __to_json__(self, attributes: list[str]) -> dict[str, str | int | None]:
+    def __to_json__(self, attributes: Sequence[str]) -> dict[str, str | int | None]:
         return {
             attr: val
             if isinstance(val := getattr(self, attr, None), int) or val is None
@@ -1,14 +1,21 @@
 import re
 from dataclasses import dataclass
 from datetime import datetime
+from typing import ClassVar
 
-from libgencomics.common import CONSTANTS, parse_value
+from libgencomics.common import (
+    CONSTANTS,
+    FetchEngine,
+    Payload,
+    interned,
+    parse_value,
+)
 
 from .edition import Edition
 from .libgen_object import LibgenObject
 
 
-@dataclass
+@dataclass(slots=True)
 class ResultFile(LibgenObject):
     issue: Edition | None
 
@@ -29,23 +36,49 @@ class ResultFile(LibgenObject):
     time_added: datetime | None = None
     time_last_modified: datetime | None = None
 
+    # attributes included when serialized
+    JSON_ATTRIBUTES: ClassVar[tuple[str, ...]] = (
+        "md5",
+        "download_link",
+        "dpi",
+        "extension",
+        "filename",
+        "filesize",
+        "id",
+        "pages",
+        "releaser",
+        "resolution",
+        "scan_type",
+        "time_added",
+        "time_created",
+        "time_last_modified",
+    )
+
     def __init__(
         self,
         *,
         id: int,
         libgen_site_url: str,
         issue: Edition | None = None,
-        response: str | None = None,
+        response: str | Payload | None = None,
+        keep_json: bool = False,
     ):
-        super().__init__(
+        LibgenObject.__init__(
+            self,
             id=id,
             url=libgen_site_url + CONSTANTS.RESULT_FILE_REQUEST,
             response=response,
         )
 
-        file_results = list(self.json_obj.values())[0]
+        file_results = self.json_obj or {}
 
         self.issue = issue
+        self.broken = False
+        self.md5 = self.download_link = self.filename = None
+        self.filesize = self.pages = None
+        self.extension = self.releaser = None
+        self.scan_type = self.resolution = self.dpi = None
+        self.time_created = self.time_added = self.time_last_modified = None
 
         if "broken" not in file_results or file_results["broken"] != "N":
             self.broken = True
@@ -60,10 +93,10 @@ class ResultFile(LibgenObject):
 
                 self.filename = None if locator is None else locator.split("\\")[-1]
 
-                self.extension = parse_value(file_results, "extension", str)
-                self.releaser = parse_value(file_results, "releaser", str)
+                self.extension = parse_value(file_results, "extension", interned)
+                self.releaser = parse_value(file_results, "releaser", interned)
 
-                self.scan_type = parse_value(file_results, "scan_type", str)
+                self.scan_type = parse_value(file_results, "scan_type", interned)
                 if (
                     not self.scan_type
                     and self.filename
@@ -74,10 +107,10 @@ class ResultFile(LibgenObject):
                     if not self.releaser:
                         match = re.search(r"\(([^()]+)\)\.cb.$", self.filename)
                         if match and match.group(1).lower() != "digital":
-                            self.releaser = match.group(1)
+                            self.releaser = interned(match.group(1))
 
-                self.resolution = parse_value(file_results, "scan_size", str)
-                self.dpi = parse_value(file_results, "dpi", str)
+                self.resolution = parse_value(file_results, "scan_size", interned)
+                self.dpi = parse_value(file_results, "dpi", interned)
 
                 self.filesize = parse_value(file_results, "filesize", int)
                 self.pages = parse_value(file_results, "archive_files_pic_count", int)
@@ -94,28 +127,38 @@ class ResultFile(LibgenObject):
                     file_results, "time_last_modified", datetime.fromisoformat
                 )
 
-    def __json__(self) -> dict[str, str | int | None]:
-        return super().__to_json__(
-            [
-                "md5",
-                "download_link",
-                "dpi",
-                "extension",
-                "filename",
-                "filesize",
-                "id",
-                "pages",
-                "releaser",
-                "resolution",
-                "scan_type",
-                "time_added",
-                "time_created",
-                "time_last_modified",
-            ]
+        if not keep_json:
+            self.json_obj = None
+
+    @classmethod
+    async def fetch(
+        cls,
+        *,
+        id: int,
+        libgen_site_url: str,
+        issue: Edition | None = None,
+        flaresolverr_url: str | None = None,
+        engine: FetchEngine | None = None,
+        keep_json: bool = False,
+    ) -> "ResultFile":
+        return cls(
+            id=id,
+            libgen_site_url=libgen_site_url,
+            issue=issue,
+            keep_json=keep_json,
+            response=await cls.fetch_response(
+                libgen_site_url + CONSTANTS.RESULT_FILE_REQUEST,
+                id,
+                flaresolverr_url,
+                engine,
+            ),
         )
 
+    def __json__(self) -> dict[str, str | int | None]:
+        return self.__to_json__(self.JSON_ATTRIBUTES)
+
     def __str__(self) -> str:
         if self.broken:
             return """{ "broken": true }"""
         else:
-            return super().__str__()
+            return LibgenObject.__str__(self)
@@ -1,12 +1,19 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime
+from typing import ClassVar
 
-from libgencomics.common import CONSTANTS, parse_value
+from libgencomics.common import (
+    CONSTANTS,
+    FetchEngine,
+    Payload,
+    interned,
+    parse_value,
+)
 
 from .libgen_object import LibgenObject
 
 
-@dataclass
+@dataclass(slots=True)
 class Series(LibgenObject):
     title: str | None = None
     publisher: str | None = None
@@ -24,15 +31,36 @@ class Series(LibgenObject):
     comicvine_url: str | None = None
     language: str | None = None
 
+    edition_ids: list[int] = field(default_factory=list)
+
+    # attributes included when serialized
+    JSON_ATTRIBUTES: ClassVar[tuple[str, ...]] = (
+        "comicvine_url",
+        "day_end",
+        "day_start",
+        "id",
+        "language",
+        "month_end",
+        "month_start",
+        "publisher",
+        "time_added",
+        "time_last_modified",
+        "title",
+        "year_start",
+        "year_end",
+    )
+
     def __init__(
         self,
         *,
         id: int,
         libgen_site_url: str,
         comicvine_url: str | None,
-        response: str | None = None,
+        response: str | Payload | None = None,
+        keep_json: bool = False,
     ):
-        super().__init__(
+        LibgenObject.__init__(
+            self,
             id=id,
             url=libgen_site_url + CONSTANTS.SERIES_REQUEST,
             response=response,
@@ -40,19 +68,22 @@ class Series(LibgenObject):
 
         series_results = {
             "add": {},
-            **list(self.json_obj.values())[0],
+            **(self.json_obj or {}),
         }
 
-        if comicvine_url is not None:
-            self.comicvine_url = comicvine_url
+        self.comicvine_url = comicvine_url
+        self.language = None
 
         for added_key in series_results["add"].values():
             if added_key["key"] == "101":
-                self.language = added_key["value"]
+                self.language = interned(added_key["value"])
 
             elif added_key["value"].startswith("https://comicvine.gamespot.com"):
                 self.comicvine_url = added_key["value"]
 
+        self.year_start = self.month_start = self.day_start = None
+        self.year_end = self.month_end = self.day_end = None
+
         if "date_start" in series_results and series_results["date_start"] is not None:
             date_start = series_results["date_start"].split("-")
 
@@ -68,7 +99,7 @@ class Series(LibgenObject):
             self.day_end = int(date_end[2])
 
         self.title = parse_value(series_results, "title", str)
-        self.publisher = parse_value(series_results, "publisher", str)
+        self.publisher = parse_value(series_results, "publisher", interned)
 
         self.time_added = parse_value(
             series_results, "time_added", datetime.fromisoformat
@@ -78,21 +109,39 @@ class Series(LibgenObject):
             series_results, "time_last_modified", datetime.fromisoformat
         )
 
-    def __json__(self) -> dict[str, str | int | None]:
-        return super().__to_json__(
-            [
-                "comicvine_url",
-                "day_end",
-                "day_start",
-                "id",
-                "language",
-                "month_end",
-                "month_start",
-                "publisher",
-                "time_added",
-                "time_last_modified",
-                "title",
-                "year_start",
-                "year_end",
-            ]
+        editions = series_results.get("editions")
+        self.edition_ids = (
+            [int(edition_id) for edition_id in editions.keys()]
+            if isinstance(editions, dict)
+            else []
         )
+
+        if not keep_json:
+            self.json_obj = None
+
+    @classmethod
+    async def fetch(
+        cls,
+        *,
+        id: int,
+        libgen_site_url: str,
+        comicvine_url: str | None,
+        flaresolverr_url: str | None = None,
+        engine: FetchEngine | None = None,
+        keep_json: bool = False,
+    ) -> "Series":
+        return cls(
+            id=id,
+            libgen_site_url=libgen_site_url,
+            comicvine_url=comicvine_url,
+            keep_json=keep_json,
+            response=await cls.fetch_response(
+                libgen_site_url + CONSTANTS.SERIES_REQUEST,
+                id,
+                flaresolverr_url,
+                engine,
+            ),
+        )
+
+    def __json__(self) -> dict[str, str | int | None]:
+        return self.__to_json__(self.JSON_ATTRIBUTES)
@@ -1,3 +1,6 @@
+from .annas_archive_resolver import AnnasArchiveResolver as AnnasArchiveResolver
+from .annas_archive_resolver import (
+    get_annas_archive_download as get_annas_archive_download,
+)
 from .libgen_search import LibgenSearch as LibgenSearch
-from .libgen_search import get_annas_archive_download as get_annas_archive_download
 from .search_request import SearchRequest as SearchRequest
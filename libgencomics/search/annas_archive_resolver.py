@@ -0,0 +1,196 @@
+from asyncio import FIRST_COMPLETED, Semaphore, create_task, gather, wait
+from collections import OrderedDict
+from collections.abc import Sequence
+from datetime import timedelta
+from functools import partial
+from itertools import cycle
+from time import monotonic
+
+from aiohttp import ClientError, ClientSession
+
+from libgencomics.common import (
+    FetchEngine,
+    SingleFlight,
+    flaresolverr_get,
+    parse_html,
+    parse_off_loop,
+)
+from libgencomics.errors import LibgenException
+
+# the slow download partner known to exist, callers pass the ones they want
+# to rotate between or race
+DEFAULT_DL_PARTNERS = (4,)
+
+
+def find_annas_archive_link(anna_response: str) -> str | None:
+    anna_soup = parse_html(anna_response)
+    for a_elem in anna_soup.select("p.mb-4 > a"):
+        if a_elem.text.count("Download with short filename") != 0:
+            return str(a_elem.attrs["href"])
+
+    return None
+
+
+async def get_annas_archive_download(
+    md5: str | None,
+    flaresolverr_url: str,
+    annas_archive_site_url: str,
+    n_dl_partner: int = 4,
+    engine: FetchEngine | None = None,
+) -> str | None:
+    if md5 is None:
+        return None
+
+    url = f"{annas_archive_site_url}/slow_download/{md5}/0/{n_dl_partner}"
+
+    if engine is None:
+        async with ClientSession() as session:
+            return await parse_off_loop(
+                find_annas_archive_link,
+                await flaresolverr_get(session, url, flaresolverr_url),
+            )
+
+    # once a challenge has been solved, the page can be fetched directly
+    # until its cookies expire
+    if engine.has_clearance(url):
+        try:
+            link = await parse_off_loop(find_annas_archive_link, await engine.get(url))
+            if link is not None:
+                return link
+        except ClientError:
+            pass
+
+    return await parse_off_loop(
+        find_annas_archive_link, await engine.solve(url, flaresolverr_url)
+    )
+
+
+# resolves the download links of many md5s at once, links found and md5s
+# without any are both remembered for a while
+class AnnasArchiveResolver:
+    def __init__(
+        self,
+        *,
+        engine: FetchEngine,
+        flaresolverr_url: str,
+        annas_archive_site_url: str,
+        dl_partners: Sequence[int] = DEFAULT_DL_PARTNERS,
+        race_partners: bool = False,
+        max_concurrent: int = 4,
+        ttl: timedelta = timedelta(hours=6),
+        negative_ttl: timedelta = timedelta(hours=1),
+        memory_cache_size: int = 65536,
+    ) -> None:
+        self.engine = engine
+        self.flaresolverr_url = flaresolverr_url
+        self.annas_archive_site_url = annas_archive_site_url
+        self.dl_partners = list(dl_partners)
+        self.race_partners = race_partners
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.memory_cache_size = memory_cache_size
+
+        self.__semaphore = Semaphore(max_concurrent)
+        self.__partners = cycle(range(len(self.dl_partners)))
+        # maps md5s to their link, or None, and when that stops being valid
+        self.__links: OrderedDict[str, tuple[str | None, float]] = OrderedDict()
+        self.__in_flight: SingleFlight[str, str | None] = SingleFlight()
+
+    def cached(self, md5: str) -> tuple[bool, str | None]:
+        if md5 not in self.__links:
+            return False, None
+
+        link, expires_at = self.__links[md5]
+        if expires_at <= monotonic():
+            del self.__links[md5]
+            return False, None
+
+        self.__links.move_to_end(md5)
+        return True, link
+
+    def remember(self, md5: str, link: str | None) -> None:
+        ttl = self.ttl if link is not None else self.negative_ttl
+        self.__links[md5] = (link, monotonic() + ttl.total_seconds())
+        self.__links.move_to_end(md5)
+
+        while len(self.__links) > self.memory_cache_size:
+            self.__links.popitem(last=False)
+
+    async def __from_partner(self, md5: str, dl_partner: int) -> str | None:
+        return await get_annas_archive_download(
+            md5,
+            self.flaresolverr_url,
+            self.annas_archive_site_url,
+            dl_partner,
+            self.engine,
+        )
+
+    # each md5 starts from a different partner so that they all share the
+    # load, the next ones are only tried when it fails, whether there is a
+    # link depends on the md5 and not on the partner
+    async def __rotate_partners(self, md5: str) -> str | None:
+        first = next(self.__partners)
+        partners = self.dl_partners[first:] + self.dl_partners[:first]
+        error: BaseException | None = None
+
+        for dl_partner in partners:
+            try:
+                return await self.__from_partner(md5, dl_partner)
+            except (ClientError, LibgenException) as e:
+                error = e
+
+        raise error or LibgenException(md5)
+
+    # every partner is asked at once, the first one to answer wins
+    async def __race_partners(self, md5: str) -> str | None:
+        pending = {
+            create_task(self.__from_partner(md5, dl_partner))
+            for dl_partner in self.dl_partners
+        }
+        error: BaseException | None = None
+
+        try:
+            while len(pending) != 0:
+                done, pending = await wait(pending, return_when=FIRST_COMPLETED)
+
+                for task in done:
+                    if (e := task.exception()) is not None:
+                        error = e
+                    else:
+                        return task.result()
+        finally:
+            for task in pending:
+                task.cancel()
+
+        raise error or LibgenException(md5)
+
+    async def get_download(self, md5: str) -> str | None:
+        found, link = self.cached(md5)
+        if found:
+            return link
+
+        return await self.__in_flight.run(md5, partial(self.__find_download, md5))
+
+    async def __find_download(self, md5: str) -> str | None:
+        async with self.__semaphore:
+            link = await (
+                self.__race_partners(md5)
+                if self.race_partners
+                else self.__rotate_partners(md5)
+            )
+
+        self.remember(md5, link)
+        return link
+
+    async def __try_get_download(self, md5: str) -> str | None:
+        try:
+            return await self.get_download(md5)
+        except (ClientError, LibgenException):
+            return None
+
+    # md5s which could not be resolved are mapped to None without being
+    # cached, so that they are tried again next time
+    async def get_downloads(self, md5s: list[str]) -> dict[str, str | None]:
+        unique_md5s = list(dict.fromkeys(md5s))
+        links = await gather(*[self.__try_get_download(md5) for md5 in unique_md5s])
+        return dict(zip(unique_md5s, links))
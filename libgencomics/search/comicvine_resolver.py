@@ -0,0 +1,147 @@
+from asyncio import (
+    AbstractEventLoop,
+    gather,
+    get_running_loop,
+    run_coroutine_threadsafe,
+)
+from collections import OrderedDict
+from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import partial
+from typing import Any, cast
+
+from simyan.comicvine import Comicvine, SQLiteCache
+from simyan.schemas.volume import Volume
+
+from libgencomics.common import RateController, RateLimits, SingleFlight
+
+COMICVINE_HOST = "comicvine.gamespot.com"
+
+
+# sqlite connections can only be used from the thread which opened them, so
+# every cache call made from a worker thread is run on the event loop thread
+class LoopBoundCache:
+    def __init__(
+        self,
+        cache: SQLiteCache,
+        loop: AbstractEventLoop,
+        on_miss: Callable[[], None],
+    ) -> None:
+        self.__cache = cache
+        self.__loop = loop
+        self.__on_miss = on_miss
+
+    def __run_on_loop(self, func: Callable[..., Any], *args, **kwargs) -> Any:
+        future: Future[Any] = Future()
+
+        def run() -> None:
+            try:
+                future.set_result(func(*args, **kwargs))
+            except BaseException as e:
+                future.set_exception(e)
+
+        self.__loop.call_soon_threadsafe(run)
+        return future.result()
+
+    def select(self, *args, **kwargs) -> Any:
+        result = self.__run_on_loop(self.__cache.select, *args, **kwargs)
+        # only requests which actually reach Comicvine count against its limit
+        if not result:
+            self.__on_miss()
+        return result
+
+    def __getattr__(self, name: str) -> Any:
+        attr = getattr(self.__cache, name)
+
+        if not callable(attr):
+            return attr
+
+        return partial(self.__run_on_loop, attr)
+
+
+class ComicvineResolver:
+    def __init__(
+        self,
+        *,
+        api_key: str,
+        cache: SQLiteCache | None = None,
+        max_workers: int = 4,
+        requests_per_second: float = 1.0,
+        memory_cache_size: int = 1024,
+    ) -> None:
+        self.api_key = api_key
+        self.cache = cache
+        self.memory_cache_size = memory_cache_size
+        self.rate_controller = RateController(
+            RateLimits(
+                initial_rate=requests_per_second,
+                min_rate=requests_per_second,
+                max_rate=requests_per_second,
+            )
+        )
+        self.executor = ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix="comicvine",
+        )
+
+        self.__comicvine: Comicvine | None = None
+        self.__volumes: OrderedDict[int, Volume] = OrderedDict()
+        self.__in_flight: SingleFlight[int, Volume] = SingleFlight()
+
+    def __get_comicvine(self, loop: AbstractEventLoop) -> Comicvine:
+        if self.__comicvine is None:
+            self.__comicvine = Comicvine(
+                api_key=self.api_key,
+                cache=None
+                if self.cache is None
+                else cast(
+                    SQLiteCache,
+                    LoopBoundCache(
+                        self.cache,
+                        loop,
+                        lambda: run_coroutine_threadsafe(
+                            self.rate_controller.acquire(COMICVINE_HOST), loop
+                        ).result(),
+                    ),
+                ),
+            )
+        return self.__comicvine
+
+    def remember(self, volume_id: int, volume: Volume) -> None:
+        self.__volumes[volume_id] = volume
+        self.__volumes.move_to_end(volume_id)
+
+        while len(self.__volumes) > self.memory_cache_size:
+            self.__volumes.popitem(last=False)
+
+    async def get_volume(self, volume_id: int) -> Volume:
+        if volume_id in self.__volumes:
+            self.__volumes.move_to_end(volume_id)
+            return self.__volumes[volume_id]
+
+        return await self.__in_flight.run(
+            volume_id, partial(self.__fetch_volume, volume_id)
+        )
+
+    async def __fetch_volume(self, volume_id: int) -> Volume:
+        loop = get_running_loop()
+        comicvine = self.__get_comicvine(loop)
+
+        # with a cache, the rate limit is only applied to cache misses
+        if self.cache is None:
+            await self.rate_controller.acquire(COMICVINE_HOST)
+
+        volume = await loop.run_in_executor(
+            self.executor,
+            partial(comicvine.get_volume, volume_id=volume_id),
+        )
+        self.remember(volume_id, volume)
+        return volume
+
+    async def get_volumes(self, volume_ids: list[int]) -> dict[int, Volume]:
+        unique_ids = list(dict.fromkeys(volume_ids))
+        volumes = await gather(*[self.get_volume(id) for id in unique_ids])
+        return dict(zip(unique_ids, volumes))
+
+    def close(self) -> None:
+        self.executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,104 @@
+from bisect import bisect_right, insort
+from collections import OrderedDict
+from collections.abc import Iterable
+
+type IssueNumber = float | tuple[float, float]
+
+
+def issue_interval(number: IssueNumber) -> tuple[float, float]:
+    if isinstance(number, tuple):
+        return (min(number), max(number))
+    return (number, number)
+
+
+# an edition covering issues 1 to 6 matches a search for issue 3 and one for
+# issues 5 to 8
+def issue_matches(number: IssueNumber | None, issue_number: IssueNumber) -> bool:
+    if number is None:
+        return False
+
+    low, high = issue_interval(number)
+    query_low, query_high = issue_interval(issue_number)
+    return low <= query_high and query_low <= high
+
+
+# the issue numbers of the editions of one series, sorted by their lower bound
+class IssueIndex:
+    def __init__(self) -> None:
+        self.__intervals: list[tuple[float, float, int]] = []
+        # every indexed edition, the ones without a number map to None
+        self.__editions: dict[int, tuple[float, float] | None] = {}
+        # no interval is wider than this, which bounds how far back a query
+        # needs to look for intervals overlapping it
+        self.__max_width = 0.0
+
+    def __contains__(self, edition_id: int) -> bool:
+        return edition_id in self.__editions
+
+    def __len__(self) -> int:
+        return len(self.__editions)
+
+    def add(self, edition_id: int, number: IssueNumber | None) -> None:
+        if (previous := self.__editions.get(edition_id)) is not None:
+            self.__intervals.remove((*previous, edition_id))
+
+        if number is None:
+            self.__editions[edition_id] = None
+            return
+
+        low, high = issue_interval(number)
+        self.__editions[edition_id] = (low, high)
+        self.__max_width = max(self.__max_width, high - low)
+        insort(self.__intervals, (low, high, edition_id))
+
+    def overlapping(self, low: float, high: float) -> list[int]:
+        start = bisect_right(self.__intervals, (low - self.__max_width,))
+        end = bisect_right(self.__intervals, (high, float("inf"), float("inf")))
+
+        return [
+            edition_id
+            for _, edition_high, edition_id in self.__intervals[start:end]
+            if edition_high >= low
+        ]
+
+    def containing(self, number: float) -> list[int]:
+        return self.overlapping(number, number)
+
+    def matching(self, issue_number: IssueNumber) -> list[int]:
+        return self.overlapping(*issue_interval(issue_number))
+
+    # the editions which can match, including the ones never indexed since
+    # their number is unknown
+    def candidates(
+        self, edition_ids: Iterable[int], issue_number: IssueNumber
+    ) -> list[int]:
+        matching = set(self.matching(issue_number))
+        return [
+            edition_id
+            for edition_id in edition_ids
+            if edition_id in matching or edition_id not in self.__editions
+        ]
+
+
+# the indexes of the series searched most recently, keyed by libgen site and
+# series id, an evicted series is only indexed again the next time it is
+# fetched
+class IssueIndexes:
+    def __init__(self, *, max_series: int = 1024) -> None:
+        self.max_series = max_series
+        self.__indexes: OrderedDict[tuple[str, int], IssueIndex] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self.__indexes)
+
+    def get(self, libgen_site_url: str, series_id: int) -> IssueIndex:
+        key = (libgen_site_url, series_id)
+
+        if (index := self.__indexes.get(key)) is not None:
+            self.__indexes.move_to_end(key)
+            return index
+
+        index = self.__indexes[key] = IssueIndex()
+        while len(self.__indexes) > self.max_series:
+            self.__indexes.popitem(last=False)
+        return index
@@ -1,36 +1,169 @@
-from aiohttp import ClientSession
-from bs4 import BeautifulSoup
-from simyan.comicvine import Comicvine, SQLiteCache
+import json
+from asyncio import Semaphore, gather
+from collections.abc import AsyncIterator, Sequence
+from contextlib import asynccontextmanager
+from types import TracebackType
+
+from simyan.comicvine import SQLiteCache
 from simyan.schemas.volume import Volume
 
-from libgencomics.common import flaresolverr_get
+from libgencomics.cache import MemorySearchCache, ObjectCache, SearchCache
+from libgencomics.common import (
+    CONSTANTS,
+    FetchEngine,
+    FetchLimits,
+    MetricsCollector,
+    MirrorPool,
+    RateController,
+    RetryPolicy,
+)
 from libgencomics.libgen_objects import ResultFile
+from libgencomics.sync import SyncDelta, SyncStateStore
 
+from .annas_archive_resolver import (
+    DEFAULT_DL_PARTNERS,
+    AnnasArchiveResolver,
+    get_annas_archive_download,
+)
+from .comicvine_resolver import ComicvineResolver
+from .issue_index import IssueIndexes, issue_matches
 from .search_request import SearchRequest
 
 
-async def get_annas_archive_download(
-    md5: str | None,
-    flaresolverr_url: str,
-    annas_archive_site_url: str,
-    n_dl_partner: int = 4,
-) -> str | None:
-    if md5 is None:
-        return None
+class LibgenSearch:
+    def __init__(
+        self,
+        *,
+        fetch_limits: FetchLimits | None = None,
+        rate_controller: RateController | None = None,
+        comicvine_workers: int = 4,
+        comicvine_requests_per_second: float = 1.0,
+        metrics: MetricsCollector | None = None,
+        mirrors: list[MirrorPool] | None = None,
+        retry_policy: RetryPolicy | None = None,
+        search_cache: SearchCache | None = None,
+        issue_index_size: int = 1024,
+    ) -> None:
+        self.engine = FetchEngine(
+            fetch_limits, rate_controller, metrics, mirrors, retry_policy
+        )
+        self.comicvine_workers = comicvine_workers
+        self.comicvine_requests_per_second = comicvine_requests_per_second
+        self.__opened = False
+        self.__engine_users = 0
+        self.__resolvers: dict[tuple[str, int], ComicvineResolver] = {}
+        # the issue numbers of the editions of the last issue_index_size series
+        self.issue_indexes = IssueIndexes(max_series=issue_index_size)
+        # the same query is only searched for once in a while, even across volumes
+        self.search_cache = search_cache or MemorySearchCache()
+        self.__annas_archive_resolvers: dict[
+            tuple[str, str, tuple[int, ...], bool], AnnasArchiveResolver
+        ] = {}
 
-    async with ClientSession() as session:
-        url = f"{annas_archive_site_url}/slow_download/{md5}/0/{n_dl_partner}"
-        anna_response = await flaresolverr_get(session, url, flaresolverr_url)
+    async def __aenter__(self) -> "LibgenSearch":
+        self.__opened = True
+        return self
 
-    anna_soup = BeautifulSoup(anna_response, "html.parser")
-    for a_elem in anna_soup.select("p.mb-4 > a"):
-        if a_elem.text.count("Download with short filename") != 0:
-            return str(a_elem.attrs["href"])
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.__opened = False
+        await self.engine.close()
 
-    return None
+        for resolver in self.__resolvers.values():
+            resolver.close()
+        self.__resolvers.clear()
 
+    # volumes are looked up off the event loop, one resolver is kept for each
+    # api key and cache so that repeated volumes are only looked up once
+    def get_comicvine_resolver(
+        self, api_key: str, cv_cache: SQLiteCache | None = None
+    ) -> ComicvineResolver:
+        key = (api_key, id(cv_cache))
+
+        if key not in self.__resolvers:
+            self.__resolvers[key] = ComicvineResolver(
+                api_key=api_key,
+                cache=cv_cache,
+                max_workers=self.comicvine_workers,
+                requests_per_second=self.comicvine_requests_per_second,
+            )
+
+        return self.__resolvers[key]
+
+    # kept for the lifetime of this object so that its cached links survive
+    # between calls
+    def get_annas_archive_resolver(
+        self,
+        flaresolverr_url: str,
+        annas_archive_site_url: str,
+        dl_partners: Sequence[int] = DEFAULT_DL_PARTNERS,
+        race_partners: bool = False,
+    ) -> AnnasArchiveResolver:
+        key = (
+            flaresolverr_url,
+            annas_archive_site_url,
+            tuple(dl_partners),
+            race_partners,
+        )
+
+        if key not in self.__annas_archive_resolvers:
+            self.__annas_archive_resolvers[key] = AnnasArchiveResolver(
+                engine=self.engine,
+                flaresolverr_url=flaresolverr_url,
+                annas_archive_site_url=annas_archive_site_url,
+                dl_partners=dl_partners,
+                race_partners=race_partners,
+            )
+
+        return self.__annas_archive_resolvers[key]
+
+    # outside of an `async with` block, the pooled session only lives for as
+    # long as there are calls using it
+    @asynccontextmanager
+    async def __engine(self) -> AsyncIterator[FetchEngine]:
+        self.__engine_users += 1
+        try:
+            yield self.engine
+        finally:
+            self.__engine_users -= 1
+            if not self.__opened and self.__engine_users == 0:
+                await self.engine.close()
+
+    def __search_request(
+        self,
+        *,
+        cv_volume: Volume,
+        libgen_site_url: str,
+        libgen_series_id: int | list[int] | None,
+        issue_number: float | tuple[float, float] | None,
+        search_unsorted: bool,
+        query: str | None,
+        libgen_cache: ObjectCache | None,
+        flaresolverr_url: str | None,
+        batch_size: int,
+        keep_json: bool,
+    ) -> SearchRequest:
+        return SearchRequest(
+            query=query or cv_volume.name,
+            start_year=cv_volume.start_year,
+            libgen_series_id=libgen_series_id,
+            libgen_site_url=libgen_site_url,
+            comicvine_url=str(cv_volume.site_url),
+            issue_number=issue_number,
+            search_unsorted=search_unsorted,
+            flaresolverr_url=flaresolverr_url,
+            batch_size=batch_size,
+            engine=self.engine,
+            cache=libgen_cache,
+            issue_indexes=self.issue_indexes,
+            search_cache=self.search_cache,
+            keep_json=keep_json,
+        )
 
-class LibgenSearch:
     async def search_comicvine_id(
         self,
         *,
@@ -42,29 +175,216 @@ class LibgenSearch:
         search_unsorted: bool = True,
         query: str | None = None,
         cv_cache: SQLiteCache | None = None,
+        libgen_cache: ObjectCache | None = None,
         flaresolverr_url: str | None = None,
+        batch_size: int = CONSTANTS.IDS_PER_REQUEST,
+        keep_json: bool = False,
     ) -> list[ResultFile]:
-        session = Comicvine(api_key=api_key, cache=cv_cache)
+        with self.engine.metrics.phase("comicvine"):
+            cv_volume = await self.get_comicvine_resolver(api_key, cv_cache).get_volume(
+                id
+            )
 
-        cv_volume: Volume = session.get_volume(volume_id=id)
+        async with self.__engine():
+            series_request = self.__search_request(
+                cv_volume=cv_volume,
+                libgen_site_url=libgen_site_url,
+                libgen_series_id=libgen_series_id,
+                issue_number=issue_number,
+                search_unsorted=search_unsorted,
+                query=query,
+                libgen_cache=libgen_cache,
+                flaresolverr_url=flaresolverr_url,
+                batch_size=batch_size,
+                keep_json=keep_json,
+            )
 
-        series_request = SearchRequest(
-            query=query or cv_volume.name,
-            start_year=cv_volume.start_year,
-            libgen_series_id=libgen_series_id,
-            libgen_site_url=libgen_site_url,
-            comicvine_url=str(cv_volume.site_url),
-            issue_number=issue_number,
-            search_unsorted=search_unsorted,
-            flaresolverr_url=flaresolverr_url,
+            editions = await series_request.fetch_editions_data()
+
+            filtered_editions = (
+                editions
+                if issue_number is None
+                else [
+                    edition
+                    for edition in editions
+                    if issue_matches(edition.number, issue_number)
+                ]
+            )
+
+            return await series_request.fetch_files_data(filtered_editions)
+
+    # yields every file as soon as it has been parsed instead of waiting for
+    # the whole series to be fetched, files come in no particular order
+    async def stream_comicvine_id(
+        self,
+        *,
+        api_key: str,
+        id: int,
+        libgen_site_url: str,
+        libgen_series_id: int | list[int] | None,
+        issue_number: float | tuple[float, float] | None = None,
+        search_unsorted: bool = True,
+        query: str | None = None,
+        cv_cache: SQLiteCache | None = None,
+        libgen_cache: ObjectCache | None = None,
+        flaresolverr_url: str | None = None,
+        batch_size: int = CONSTANTS.IDS_PER_REQUEST,
+        keep_json: bool = False,
+    ) -> AsyncIterator[ResultFile]:
+        with self.engine.metrics.phase("comicvine"):
+            cv_volume = await self.get_comicvine_resolver(api_key, cv_cache).get_volume(
+                id
+            )
+
+        async with self.__engine():
+            series_request = self.__search_request(
+                cv_volume=cv_volume,
+                libgen_site_url=libgen_site_url,
+                libgen_series_id=libgen_series_id,
+                issue_number=issue_number,
+                search_unsorted=search_unsorted,
+                query=query,
+                libgen_cache=libgen_cache,
+                flaresolverr_url=flaresolverr_url,
+                batch_size=batch_size,
+                keep_json=keep_json,
+            )
+
+            async for file in series_request.stream_files_data(
+                None
+                if issue_number is None
+                else lambda edition: issue_matches(edition.number, issue_number)
+            ):
+                yield file
+
+    # the delta since the previous sync of the same search, whose state is
+    # then replaced in the store
+    async def sync_comicvine_id(
+        self,
+        *,
+        api_key: str,
+        id: int,
+        libgen_site_url: str,
+        libgen_series_id: int | list[int] | None,
+        state_store: SyncStateStore,
+        issue_number: float | tuple[float, float] | None = None,
+        search_unsorted: bool = True,
+        query: str | None = None,
+        cv_cache: SQLiteCache | None = None,
+        libgen_cache: ObjectCache | None = None,
+        flaresolverr_url: str | None = None,
+        batch_size: int = CONSTANTS.IDS_PER_REQUEST,
+        keep_json: bool = False,
+    ) -> SyncDelta:
+        with self.engine.metrics.phase("comicvine"):
+            cv_volume = await self.get_comicvine_resolver(api_key, cv_cache).get_volume(
+                id
+            )
+
+        key = json.dumps(
+            [
+                libgen_site_url,
+                id,
+                libgen_series_id,
+                issue_number,
+                search_unsorted,
+                query,
+            ]
         )
 
-        editions = await series_request.fetch_editions_data()
+        async with self.__engine():
+            series_request = self.__search_request(
+                cv_volume=cv_volume,
+                libgen_site_url=libgen_site_url,
+                libgen_series_id=libgen_series_id,
+                issue_number=issue_number,
+                search_unsorted=search_unsorted,
+                query=query,
+                libgen_cache=libgen_cache,
+                flaresolverr_url=flaresolverr_url,
+                batch_size=batch_size,
+                keep_json=keep_json,
+            )
+
+            delta, state = await series_request.sync_files_data(state_store.get(key))
+
+        state_store.set(key, state)
+        return delta
+
+    # searches many volumes at once, objects shared between them are only
+    # fetched once since every search goes through the same engine
+    async def search_comicvine_ids(
+        self,
+        *,
+        api_key: str,
+        volumes: list[tuple[int, float | tuple[float, float] | None]],
+        libgen_site_url: str,
+        search_unsorted: bool = True,
+        cv_cache: SQLiteCache | None = None,
+        libgen_cache: ObjectCache | None = None,
+        flaresolverr_url: str | None = None,
+        batch_size: int = CONSTANTS.IDS_PER_REQUEST,
+        keep_json: bool = False,
+        max_concurrent_volumes: int = 8,
+    ) -> dict[tuple[int, float | tuple[float, float] | None], list[ResultFile]]:
+        semaphore = Semaphore(max_concurrent_volumes)
+        unique_volumes = list(dict.fromkeys(volumes))
+
+        async def search_volume(
+            id: int, issue_number: float | tuple[float, float] | None
+        ) -> list[ResultFile]:
+            async with semaphore:
+                return await self.search_comicvine_id(
+                    api_key=api_key,
+                    id=id,
+                    libgen_site_url=libgen_site_url,
+                    libgen_series_id=None,
+                    issue_number=issue_number,
+                    search_unsorted=search_unsorted,
+                    cv_cache=cv_cache,
+                    libgen_cache=libgen_cache,
+                    flaresolverr_url=flaresolverr_url,
+                    batch_size=batch_size,
+                    keep_json=keep_json,
+                )
 
-        filtered_editions = (
-            editions
-            if issue_number is None
-            else [edition for edition in editions if edition.number == issue_number]
+        async with self.__engine():
+            results = await gather(
+                *[
+                    search_volume(id, issue_number)
+                    for id, issue_number in unique_volumes
+                ]
+            )
+
+        return dict(zip(unique_volumes, results))
+
+    async def get_annas_archive_download(
+        self,
+        md5: str | None,
+        flaresolverr_url: str,
+        annas_archive_site_url: str,
+        n_dl_partner: int = 4,
+    ) -> str | None:
+        async with self.__engine() as engine:
+            return await get_annas_archive_download(
+                md5,
+                flaresolverr_url,
+                annas_archive_site_url,
+                n_dl_partner,
+                engine,
+            )
+
+    async def get_annas_archive_downloads(
+        self,
+        md5s: list[str],
+        flaresolverr_url: str,
+        annas_archive_site_url: str,
+        dl_partners: Sequence[int] = DEFAULT_DL_PARTNERS,
+        race_partners: bool = False,
+    ) -> dict[str, str | None]:
+        resolver = self.get_annas_archive_resolver(
+            flaresolverr_url, annas_archive_site_url, dl_partners, race_partners
         )
 
-        return await series_request.fetch_files_data(filtered_editions)
+        async with self.__engine():
+            return await resolver.get_downloads(md5s)
@@ -1,14 +1,33 @@
+import re
+from asyncio import Queue, TaskGroup, create_task, gather
+from collections.abc import AsyncIterator, Awaitable, Callable
 from enum import StrEnum
+from time import perf_counter
+from typing import Any
 
 from bs4 import BeautifulSoup
 
+from libgencomics.cache import ObjectCache, SearchCache
 from libgencomics.common import (
     CONSTANTS,
+    FetchEngine,
+    MetricsCollector,
+    Payload,
     attempt_request,
     check_response_error,
+    fetch_multiple_ids,
     fetch_multiple_urls,
+    parse_html,
+    parse_off_loop,
+    payload_time_last_modified,
+    stream_multiple_ids,
 )
 from libgencomics.libgen_objects import Edition, ResultFile, Series
+from libgencomics.sync import EditionState, SyncDelta, SyncState
+
+from .issue_index import IssueIndex, IssueIndexes, issue_matches
+
+PAGE_LINK = re.compile(r"[?&]page=(\d+)")
 
 
 class Category(StrEnum):
@@ -77,6 +96,12 @@ class SearchRequest:
         issue_number: float | tuple[float, float] | None = None,
         search_unsorted: bool = True,
         flaresolverr_url: str | None = None,
+        batch_size: int = CONSTANTS.IDS_PER_REQUEST,
+        engine: FetchEngine | None = None,
+        cache: ObjectCache | None = None,
+        keep_json: bool = False,
+        issue_indexes: IssueIndexes | None = None,
+        search_cache: SearchCache | None = None,
     ) -> None:
         self.query = query
         self.start_year = start_year
@@ -86,8 +111,49 @@ class SearchRequest:
         self.issue_number = issue_number
         self.search_unsorted = search_unsorted
         self.flaresolverr_url = flaresolverr_url
+        self.batch_size = batch_size
+        self.engine = engine
+        self.cache = cache
+        self.keep_json = keep_json
+        self.issue_indexes = issue_indexes
+        self.search_cache = search_cache
+        self.metrics = engine.metrics if engine is not None else MetricsCollector()
+
+    def parse_object[T: (Series, Edition, ResultFile)](
+        self, object_type: type[T], **kwargs: Any
+    ) -> T:
+        start = perf_counter()
+        obj = object_type(keep_json=self.keep_json, **kwargs)
+        self.metrics.on_parse(object_type.__name__, perf_counter() - start)
+        return obj
+
+    async def fetch_objects(
+        self, request: str, ids: list[int] | list[str]
+    ) -> dict[str, Payload]:
+        return await fetch_multiple_ids(
+            self.libgen_site_url,
+            request,
+            ids,
+            self.flaresolverr_url,
+            self.batch_size,
+            self.engine,
+            self.cache,
+        )
 
-    def get_search_page(self, unsorted=False) -> tuple[str, str]:
+    def stream_objects(
+        self, request: str, ids: list[int] | list[str]
+    ) -> AsyncIterator[dict[str, Payload]]:
+        return stream_multiple_ids(
+            self.libgen_site_url,
+            request,
+            ids,
+            self.flaresolverr_url,
+            self.batch_size,
+            self.engine,
+            self.cache,
+        )
+
+    def get_search_url(self, unsorted=False, page: int | None = None) -> str:
         if unsorted:
             final_query = (
                 f"{self.query} {self.issue_number}"
@@ -95,59 +161,116 @@ class SearchRequest:
                 else self.query
             )
 
-            search_url = build_search_url(
+            return build_search_url(
                 base=self.libgen_site_url,
                 query=final_query,
                 category=Category.FILES,
+                paging=CONSTANTS.UNSORTED_PAGING,
+                page=page,
                 sort=SearchSorted.UNSORTED,
             )
-        else:
-            search_url = build_search_url(
-                base=self.libgen_site_url,
-                query=self.query,
-                category=Category.SERIES,
-            )
 
+        return build_search_url(
+            base=self.libgen_site_url,
+            query=self.query,
+            category=Category.SERIES,
+        )
+
+    async def get_search_page(
+        self, unsorted=False, page: int | None = None
+    ) -> tuple[str, str]:
+        search_url = self.get_search_url(unsorted, page)
+        responses = await fetch_multiple_urls(
+            [search_url], self.flaresolverr_url, self.engine
+        )
+        return search_url, responses[0]
+
+    # blocking fallback for callers which are not running an event loop
+    def get_search_page_sync(self, unsorted=False) -> tuple[str, str]:
+        search_url = self.get_search_url(unsorted)
         return search_url, attempt_request(search_url)
 
-    def get_search_soup(self, unsorted=False) -> BeautifulSoup:
-        url, response = self.get_search_page(unsorted)
-        return check_response_error(url, response)[1]
+    async def get_search_soup(
+        self, unsorted=False, page: int | None = None
+    ) -> BeautifulSoup:
+        url, response = await self.get_search_page(unsorted, page)
+        return await parse_off_loop(
+            lambda markup: parse_html(check_response_error(url, markup)), response
+        )
+
+    # the highest page linked to by the paginator
+    def get_page_count(self, soup: BeautifulSoup) -> int:
+        pages = [
+            int(match.group(1))
+            for link in soup.select("a[href*='page=']")
+            if (match := PAGE_LINK.search(str(link.attrs["href"]))) is not None
+        ]
+        return max(pages, default=1)
 
-    async def aggregate_series_data(self, soup: BeautifulSoup) -> list[Series]:
+    def get_json_link_ids(self, soup: BeautifulSoup, object_type: str) -> list[str]:
         json_link = soup.select_one("li.navbar-right a.nav-link")
 
         if json_link is None:
             return []
 
-        raw_series_ids = json_link.attrs["href"]
+        raw_ids = json_link.attrs["href"]
 
-        if not raw_series_ids:
+        if not raw_ids:
             return []
 
-        raw_series_ids = str(raw_series_ids)
-        if raw_series_ids.count("/json.php?object=s&ids=") == 0:
+        raw_ids = str(raw_ids)
+        request = f"/json.php?object={object_type}&ids="
+        if raw_ids.count(request) == 0:
             return []
-        raw_series_ids = raw_series_ids.replace("/json.php?object=s&ids=", "")
 
-        series_ids = raw_series_ids.split(",")
+        return [id for id in raw_ids.replace(request, "").split(",") if id]
 
-        series_requests = await fetch_multiple_urls(
-            [
-                self.libgen_site_url + CONSTANTS.SERIES_REQUEST + str(series_id)
-                for series_id in series_ids
-            ],
-            self.flaresolverr_url,
+    # the ids found by the search at url, identical searches are only made
+    # once while they are in flight and then for as long as they are cached
+    async def get_search_ids(
+        self, url: str, search: Callable[[], Awaitable[list[str]]]
+    ) -> list[str]:
+        if (
+            self.search_cache is not None
+            and (ids := self.search_cache.get(url)) is not None
+        ):
+            return ids
+
+        async def search_and_cache() -> list[str]:
+            ids = await search()
+            if self.search_cache is not None:
+                self.search_cache.set(url, ids)
+            return ids
+
+        if self.engine is None:
+            return await search_and_cache()
+
+        return list(await self.engine.searches_in_flight.run(url, search_and_cache))
+
+    async def fetch_series_ids(self) -> list[str]:
+        soup = await self.get_search_soup()
+        return self.get_json_link_ids(soup, "s")
+
+    async def aggregate_series_data(self, series_ids: list[str]) -> list[Series]:
+        if len(series_ids) == 0:
+            return []
+
+        series_responses = await self.fetch_objects(
+            CONSTANTS.SERIES_REQUEST, series_ids
         )
 
         matched_series: list[Series] = []
 
-        for index, response in enumerate(series_requests):
-            series = Series(
-                id=int(series_ids[index]),
+        for series_id in series_ids:
+            if series_id not in series_responses:
+                continue
+
+            series = self.parse_object(
+                Series,
+                id=int(series_id),
                 libgen_site_url=self.libgen_site_url,
                 comicvine_url=None,
-                response=response,
+                response=series_responses[series_id],
             )
 
             if series.comicvine_url is not None:
@@ -160,51 +283,135 @@ class SearchRequest:
         return matched_series
 
     async def get_series(self) -> list[Series]:
+        with self.metrics.phase("series"):
+            return await self.fetch_series()
+
+    async def fetch_series(self) -> list[Series]:
         if self.libgen_series_id is not None:
             series_ids: list[int] = (
                 self.libgen_series_id
                 if isinstance(self.libgen_series_id, list)
                 else [self.libgen_series_id]
             )
-            series_requests = await fetch_multiple_urls(
-                [
-                    self.libgen_site_url + CONSTANTS.SERIES_REQUEST + str(series_id)
-                    for series_id in series_ids
-                ],
-                self.flaresolverr_url,
+            series_responses = await self.fetch_objects(
+                CONSTANTS.SERIES_REQUEST, series_ids
             )
             return [
-                Series(
-                    id=series_ids[index],
+                self.parse_object(
+                    Series,
+                    id=series_id,
                     libgen_site_url=self.libgen_site_url,
                     comicvine_url=self.comicvine_url,
-                    response=response,
+                    response=series_responses[str(series_id)],
                 )
-                for index, response in enumerate(series_requests)
+                for series_id in series_ids
+                if str(series_id) in series_responses
             ]
 
-        soup = self.get_search_soup()
-        return await self.aggregate_series_data(soup)
+        found_ids = await self.get_search_ids(
+            self.get_search_url(), self.fetch_series_ids
+        )
+        return await self.aggregate_series_data(found_ids)
 
     async def get_unsorted_files_ids(self) -> list[str]:
-        soup = self.get_search_soup(unsorted=True)
+        with self.metrics.phase("unsorted"):
+            return await self.get_search_ids(
+                self.get_search_url(unsorted=True), self.fetch_unsorted_files_ids
+            )
 
-        json_link = soup.select_one("li.navbar-right a.nav-link")
+    # the pages after the first are fetched a window at a time, until one of
+    # them is not full or a whole window brings no new ids
+    async def fetch_unsorted_files_ids(self) -> list[str]:
+        soup = await self.get_search_soup(unsorted=True)
+
+        files_ids = dict.fromkeys(self.get_json_link_ids(soup, "f"))
+        page_size = len(files_ids)
+        page_count = self.get_page_count(soup)
+
+        # the mirror may cap the page size, a short first page only
+        # means there are no others when no other page is linked to
+        if page_size == 0 or (
+            page_count == 1 and page_size < CONSTANTS.UNSORTED_PAGING
+        ):
+            return list(files_ids)
+
+        page = 2
+        while page <= CONSTANTS.MAX_UNSORTED_PAGES:
+            # past the linked pages, a single page is enough to check if
+            # the paginator was cut short, without one it could be anything
+            if page <= page_count:
+                last_page = page_count
+            elif page_count != 1:
+                last_page = page
+            else:
+                last_page = page + CONSTANTS.UNSORTED_PAGES_PER_WINDOW - 1
+            last_page = min(last_page, CONSTANTS.MAX_UNSORTED_PAGES)
+
+            soups = await gather(
+                *[
+                    self.get_search_soup(unsorted=True, page=p)
+                    for p in range(page, last_page + 1)
+                ]
+            )
 
-        if json_link is None:
-            return []
+            found_last_page = False
+            n_new_ids = 0
 
-        raw_files_ids = json_link.attrs["href"]
+            for page_soup in soups:
+                page_count = max(page_count, self.get_page_count(page_soup))
+                page_ids = self.get_json_link_ids(page_soup, "f")
+                found_last_page = found_last_page or len(page_ids) < page_size
 
-        if not raw_files_ids:
-            return []
+                for id in page_ids:
+                    if id not in files_ids:
+                        files_ids[id] = None
+                        n_new_ids += 1
 
-        raw_files_ids = str(raw_files_ids)
-        if raw_files_ids.count("/json.php?object=f&ids=") == 0:
-            return []
-        raw_files_ids = raw_files_ids.replace("/json.php?object=f&ids=", "")
+            if found_last_page or n_new_ids == 0:
+                break
+
+            page = last_page + 1
+
+        return list(files_ids)
+
+    def get_issue_index(self, series: Series) -> IssueIndex | None:
+        if self.issue_indexes is None:
+            return None
+
+        return self.issue_indexes.get(self.libgen_site_url, series.id)
 
-        return raw_files_ids.split(",")
+    def index_editions(self, editions: list[Edition]) -> None:
+        for edition in editions:
+            if (index := self.get_issue_index(edition.series)) is not None:
+                index.add(edition.id, edition.number)
+
+    # once editions have been indexed, only the ones which can match the
+    # issue number are fetched again
+    def get_editions_ids(self, series: list[Series]) -> list[tuple[int, Series]]:
+        edition_ids: list[tuple[int, Series]] = []
+
+        for s in series:
+            ids = s.edition_ids
+
+            if (
+                self.issue_number is not None
+                and (index := self.get_issue_index(s)) is not None
+            ):
+                ids = index.candidates(ids, self.issue_number)
+
+            for edition_id in ids:
+                edition_ids.append((edition_id, s))
+
+        return edition_ids
+
+    def get_files_ids(self, issues: list[Edition]) -> list[tuple[str, Edition | None]]:
+        result_files_ids: list[tuple[str, Edition | None]] = []
+
+        for issue in issues:
+            for file_id in issue.file_ids:
+                result_files_ids.append((file_id, issue))
+
+        return result_files_ids
 
     async def fetch_editions_data(self) -> list[Edition]:
         series = await self.get_series()
@@ -213,43 +420,58 @@ class SearchRequest:
             return []
 
         output_data: list[Edition] = []
-        edition_ids: list[tuple[int, Series]] = []
+        edition_ids = self.get_editions_ids(series)
 
-        for s in series:
-            for key in list(s.get("editions").keys()):
-                edition_ids.append((int(key), s))
-
-        edition_requests = await fetch_multiple_urls(
-            [
-                self.libgen_site_url + CONSTANTS.EDITION_REQUEST + str(ed_id)
-                for ed_id, _ in edition_ids
-            ],
-            self.flaresolverr_url,
-        )
+        with self.metrics.phase("editions"):
+            edition_responses = await self.fetch_objects(
+                CONSTANTS.EDITION_REQUEST, [ed_id for ed_id, _ in edition_ids]
+            )
+
+        for ed_id, s in edition_ids:
+            if str(ed_id) not in edition_responses:
+                continue
 
-        for index, response in enumerate(edition_requests):
             output_data.append(
-                Edition(
-                    id=edition_ids[index][0],
-                    series=edition_ids[index][1],
+                self.parse_object(
+                    Edition,
+                    id=ed_id,
+                    series=s,
                     libgen_site_url=self.libgen_site_url,
-                    response=response,
+                    response=edition_responses[str(ed_id)],
                 )
             )
 
+        self.index_editions(output_data)
         return output_data
 
-    async def fetch_files_data(self, issues: list[Edition]) -> list[ResultFile]:
-        result_files_ids: list[tuple[str, Edition | None]] = []
+    # yields editions batch by batch, in no particular order
+    async def stream_editions_data(self) -> AsyncIterator[list[Edition]]:
+        series = await self.get_series()
 
-        for issue in issues:
-            try:
-                files = list(issue.get("files").values())
-            except KeyError:
-                files = []
+        edition_series: dict[str, list[Series]] = {}
+        for ed_id, s in self.get_editions_ids(series):
+            edition_series.setdefault(str(ed_id), []).append(s)
+
+        async for edition_responses in self.stream_objects(
+            CONSTANTS.EDITION_REQUEST, list(edition_series.keys())
+        ):
+            editions = [
+                self.parse_object(
+                    Edition,
+                    id=int(ed_id),
+                    series=s,
+                    libgen_site_url=self.libgen_site_url,
+                    response=response,
+                )
+                for ed_id, response in edition_responses.items()
+                for s in edition_series.get(ed_id, [])
+            ]
 
-            for result_file in files:
-                result_files_ids.append((result_file["f_id"], issue))
+            self.index_editions(editions)
+            yield editions
+
+    async def fetch_files_data(self, issues: list[Edition]) -> list[ResultFile]:
+        result_files_ids = self.get_files_ids(issues)
 
         if self.search_unsorted:
             result_files_ids += [
@@ -258,23 +480,280 @@ class SearchRequest:
 
         output_data: list[ResultFile] = []
 
-        file_requests = await fetch_multiple_urls(
-            [
-                self.libgen_site_url + CONSTANTS.RESULT_FILE_REQUEST + file_id
-                for file_id, _ in result_files_ids
-            ],
-            self.flaresolverr_url,
-        )
+        with self.metrics.phase("files"):
+            file_responses = await self.fetch_objects(
+                CONSTANTS.RESULT_FILE_REQUEST,
+                [file_id for file_id, _ in result_files_ids],
+            )
 
-        for index, response in enumerate(file_requests):
-            file = ResultFile(
-                id=int(result_files_ids[index][0]),
-                issue=result_files_ids[index][1],
+        for file_id, issue in result_files_ids:
+            if str(file_id) not in file_responses:
+                continue
+
+            file = self.parse_object(
+                ResultFile,
+                id=int(file_id),
+                issue=issue,
                 libgen_site_url=self.libgen_site_url,
-                response=response,
+                response=file_responses[str(file_id)],
             )
 
             if not file.broken:
                 output_data.append(file)
 
         return output_data
+
+    # yields files batch by batch, in no particular order
+    async def stream_result_files(
+        self, result_files_ids: list[tuple[str, Edition | None]]
+    ) -> AsyncIterator[list[ResultFile]]:
+        file_issues: dict[str, list[Edition | None]] = {}
+        for file_id, issue in result_files_ids:
+            file_issues.setdefault(str(file_id), []).append(issue)
+
+        async for file_responses in self.stream_objects(
+            CONSTANTS.RESULT_FILE_REQUEST, list(file_issues.keys())
+        ):
+            files = [
+                self.parse_object(
+                    ResultFile,
+                    id=int(file_id),
+                    issue=issue,
+                    libgen_site_url=self.libgen_site_url,
+                    response=response,
+                )
+                for file_id, response in file_responses.items()
+                for issue in file_issues.get(file_id, [])
+            ]
+            yield [file for file in files if not file.broken]
+
+    # pipelines series, editions and files so that every file is yielded as
+    # soon as the batch it came in has been parsed
+    async def stream_files_data(
+        self, edition_filter: Callable[[Edition], bool] | None = None
+    ) -> AsyncIterator[ResultFile]:
+        queue: Queue[list[ResultFile] | None] = Queue()
+
+        async def produce_files(
+            result_files_ids: list[tuple[str, Edition | None]],
+        ) -> None:
+            async for files in self.stream_result_files(result_files_ids):
+                await queue.put(files)
+
+        async def produce_unsorted_files() -> None:
+            await produce_files(
+                [(id, None) for id in (await self.get_unsorted_files_ids())]
+            )
+
+        # the producer does not wait on the consumer, so its phases only
+        # measure time spent fetching and parsing
+        async def produce() -> None:
+            try:
+                with self.metrics.phase("files"):
+                    async with TaskGroup() as tg:
+                        if self.search_unsorted:
+                            tg.create_task(produce_unsorted_files())
+
+                        with self.metrics.phase("editions"):
+                            async for editions in self.stream_editions_data():
+                                issues = [
+                                    edition
+                                    for edition in editions
+                                    if edition_filter is None or edition_filter(edition)
+                                ]
+                                tg.create_task(
+                                    produce_files(self.get_files_ids(issues))
+                                )
+            # raise the first failure on its own like gather does, so that
+            # streaming fails with the same exceptions as fetch_files_data
+            except BaseExceptionGroup as group:
+                error: BaseException = group
+                while isinstance(error, BaseExceptionGroup):
+                    error = error.exceptions[0]
+                raise error from None
+            finally:
+                await queue.put(None)
+
+        producer = create_task(produce())
+
+        try:
+            while (files := await queue.get()) is not None:
+                for file in files:
+                    yield file
+
+            await producer
+        finally:
+            producer.cancel()
+
+    # maps the ids still on the mirror to their time_last_modified
+    async def revalidate_objects(
+        self, object_type: str, ids: list[str]
+    ) -> dict[str, str | None]:
+        if len(ids) == 0:
+            return {}
+
+        responses = await fetch_multiple_ids(
+            self.libgen_site_url,
+            CONSTANTS.REVALIDATE_REQUEST.format(object_type),
+            ids,
+            self.flaresolverr_url,
+            self.batch_size,
+            self.engine,
+        )
+        return {
+            id: payload_time_last_modified(payload) for id, payload in responses.items()
+        }
+
+    # the cached copies of objects the mirror says were modified are dropped,
+    # so they are fetched again even while still fresh and then cached anew
+    def forget_objects(self, object_type: str, ids: list[str]) -> None:
+        if self.cache is not None and len(ids) != 0:
+            self.cache.delete_many(self.libgen_site_url, object_type, ids)
+
+    def parse_editions(
+        self, edition_series: dict[str, Series], responses: dict[str, Payload]
+    ) -> dict[str, Edition]:
+        editions = {
+            id: self.parse_object(
+                Edition,
+                id=int(id),
+                series=edition_series[id],
+                libgen_site_url=self.libgen_site_url,
+                response=response,
+            )
+            for id, response in responses.items()
+            if id in edition_series
+        }
+
+        self.index_editions(list(editions.values()))
+        return editions
+
+    # only fetches the editions and files which are new or were modified
+    # since the previous state, an edition is expected to be modified when
+    # files are added to or removed from it
+    async def sync_files_data(
+        self, previous: SyncState | None = None
+    ) -> tuple[SyncDelta, SyncState]:
+        previous = previous or SyncState()
+        state = SyncState()
+        delta = SyncDelta()
+
+        edition_series: dict[str, Series] = {
+            str(edition_id): s
+            for s in await self.get_series()
+            for edition_id in s.edition_ids
+        }
+
+        with self.metrics.phase("editions"):
+            known_editions = await self.revalidate_objects(
+                "e", [id for id in edition_series if id in previous.editions]
+            )
+            modified_editions = {
+                id
+                for id, time_last_modified in known_editions.items()
+                if time_last_modified != previous.editions[id].time_last_modified
+            }
+            self.forget_objects("e", list(modified_editions))
+            edition_responses = await self.fetch_objects(
+                CONSTANTS.EDITION_REQUEST,
+                [
+                    id
+                    for id in edition_series
+                    if id not in known_editions or id in modified_editions
+                ],
+            )
+            editions = self.parse_editions(edition_series, edition_responses)
+
+        for id in edition_series:
+            if id in editions:
+                state.editions[id] = EditionState(
+                    time_last_modified=payload_time_last_modified(
+                        edition_responses[id]
+                    ),
+                    number=editions[id].number,
+                    file_ids=editions[id].file_ids,
+                )
+            elif id in known_editions:
+                state.editions[id] = previous.editions[id]
+
+        file_editions: dict[str, str | None] = {
+            file_id: id
+            for id, edition in state.editions.items()
+            if self.issue_number is None
+            or issue_matches(edition.number, self.issue_number)
+            for file_id in edition.file_ids
+        }
+
+        if self.search_unsorted:
+            for file_id in await self.get_unsorted_files_ids():
+                file_editions.setdefault(file_id, None)
+
+        with self.metrics.phase("files"):
+            previous_files = previous.files | previous.broken_files
+            known_files = await self.revalidate_objects(
+                "f", [id for id in file_editions if id in previous_files]
+            )
+            modified_files = {
+                id
+                for id, time_last_modified in known_files.items()
+                if time_last_modified != previous_files[id]
+            }
+            self.forget_objects("f", list(modified_files))
+            to_fetch = [
+                id
+                for id in file_editions
+                if id not in known_files or id in modified_files
+            ]
+
+            # files which changed without their edition still need it
+            missing_editions = {
+                edition_id
+                for id in to_fetch
+                if (edition_id := file_editions[id]) is not None
+                and edition_id not in editions
+            }
+            if len(missing_editions) != 0:
+                editions.update(
+                    self.parse_editions(
+                        edition_series,
+                        await self.fetch_objects(
+                            CONSTANTS.EDITION_REQUEST, list(missing_editions)
+                        ),
+                    )
+                )
+
+            file_responses = await self.fetch_objects(
+                CONSTANTS.RESULT_FILE_REQUEST, to_fetch
+            )
+
+        for id in file_editions:
+            if id in file_responses:
+                file = self.parse_object(
+                    ResultFile,
+                    id=int(id),
+                    issue=editions.get(file_editions[id] or ""),
+                    libgen_site_url=self.libgen_site_url,
+                    response=file_responses[id],
+                )
+                time_last_modified = payload_time_last_modified(file_responses[id])
+
+                # broken files are kept apart, so that they are added once
+                # fixed and removed only if they were reported before
+                if file.broken:
+                    state.broken_files[id] = time_last_modified
+                    continue
+
+                state.files[id] = time_last_modified
+
+                if id in previous.files:
+                    delta.changed.append(file)
+                else:
+                    delta.added.append(file)
+
+            elif id in previous.files and id in known_files:
+                state.files[id] = previous.files[id]
+            elif id in known_files:
+                state.broken_files[id] = previous.broken_files[id]
+
+        delta.removed += [int(id) for id in previous.files if id not in state.files]
+        return delta, state
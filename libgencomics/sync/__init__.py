@@ -0,0 +1,5 @@
+from .sqlite_sync_state_store import SQLiteSyncStateStore as SQLiteSyncStateStore
+from .sync_state import EditionState as EditionState
+from .sync_state import SyncDelta as SyncDelta
+from .sync_state import SyncState as SyncState
+from .sync_state import SyncStateStore as SyncStateStore
@@ -0,0 +1,48 @@
+import json
+import sqlite3
+from pathlib import Path
+from time import time
+
+from .sync_state import SyncState, SyncStateStore
+
+
+class SQLiteSyncStateStore(SyncStateStore):
+    def __init__(self, path: Path | str | None = None) -> None:
+        if path is None:
+            path = Path.home() / ".cache" / "libgencomics" / "sync.sqlite"
+            path.parent.mkdir(parents=True, exist_ok=True)
+
+        self.connection = sqlite3.connect(path)
+        self.connection.execute(
+            """CREATE TABLE IF NOT EXISTS sync_state (
+                key TEXT PRIMARY KEY,
+                state TEXT NOT NULL,
+                synced_at REAL NOT NULL
+            )"""
+        )
+        self.connection.commit()
+
+    def get(self, key: str) -> SyncState | None:
+        row = self.connection.execute(
+            "SELECT state FROM sync_state WHERE key = ?", (key,)
+        ).fetchone()
+
+        if row is None:
+            return None
+
+        return SyncState.from_json(json.loads(row[0]))
+
+    def set(self, key: str, state: SyncState) -> None:
+        self.connection.execute(
+            "INSERT OR REPLACE INTO sync_state (key, state, synced_at) "
+            "VALUES (?, ?, ?)",
+            (key, json.dumps(state.to_json()), time()),
+        )
+        self.connection.commit()
+
+    def delete(self, key: str) -> None:
+        self.connection.execute("DELETE FROM sync_state WHERE key = ?", (key,))
+        self.connection.commit()
+
+    def close(self) -> None:
+        self.connection.close()
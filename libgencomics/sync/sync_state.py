@@ -0,0 +1,71 @@
+from dataclasses import dataclass, field
+from typing import Any
+
+from libgencomics.libgen_objects import ResultFile
+
+
+@dataclass
+class EditionState:
+    time_last_modified: str | None
+    number: float | tuple[float, float] | None
+    file_ids: list[str]
+
+
+# what the previous run of a search knew about the objects it found
+@dataclass
+class SyncState:
+    editions: dict[str, EditionState] = field(default_factory=dict)
+    # maps file ids to their time_last_modified
+    files: dict[str, str | None] = field(default_factory=dict)
+    # the same for broken files, which were never reported
+    broken_files: dict[str, str | None] = field(default_factory=dict)
+
+    def to_json(self) -> dict[str, Any]:
+        return {
+            "editions": {
+                id: {
+                    "time_last_modified": edition.time_last_modified,
+                    "number": edition.number,
+                    "file_ids": edition.file_ids,
+                }
+                for id, edition in self.editions.items()
+            },
+            "files": self.files,
+            "broken_files": self.broken_files,
+        }
+
+    @classmethod
+    def from_json(cls, json_obj: dict[str, Any]) -> "SyncState":
+        return cls(
+            editions={
+                id: EditionState(
+                    time_last_modified=edition["time_last_modified"],
+                    number=tuple(edition["number"])
+                    if isinstance(edition["number"], list)
+                    else edition["number"],
+                    file_ids=edition["file_ids"],
+                )
+                for id, edition in json_obj["editions"].items()
+            },
+            files=json_obj["files"],
+            broken_files=json_obj.get("broken_files", {}),
+        )
+
+
+@dataclass
+class SyncDelta:
+    added: list[ResultFile] = field(default_factory=list)
+    changed: list[ResultFile] = field(default_factory=list)
+    # ids of the files which are gone or broken since the previous run
+    removed: list[int] = field(default_factory=list)
+
+
+class SyncStateStore:
+    def get(self, key: str) -> SyncState | None:
+        raise NotImplementedError()
+
+    def set(self, key: str, state: SyncState) -> None:
+        raise NotImplementedError()
+
+    def delete(self, key: str) -> None:
+        raise NotImplementedError()
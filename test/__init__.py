@@ -1,9 +1,11 @@
 import asyncio
 
-from libgencomics import LibgenSearch, get_annas_archive_download
+from libgencomics import LibgenSearch
 
-with open(".api") as file:
-    api_key = file.read().replace("\n", "")
+
+def get_api_key() -> str:
+    with open(".api") as file:
+        return file.read().replace("\n", "")
 
 
 def run_test(
@@ -16,29 +18,28 @@ def run_test(
 ) -> None:
     print("\n>>>\tSearching for Comicvine ID: " + str(cv_id))
 
-    t = LibgenSearch()
-
     async def _run_test():
         try:
-            titles = await t.search_comicvine_id(
-                api_key=api_key,
-                id=cv_id,
-                issue_number=issue_number,
-                libgen_site_url="https://libgen.la",
-                libgen_series_id=libgen_series_id,
-                search_unsorted=search_unsorted,
-                flaresolverr_url=flaresolverr_url,
-            )
-            for elem in titles:
-                print(elem)
-                if flaresolverr_url is not None:
-                    print(
-                        await get_annas_archive_download(
-                            elem.md5,
-                            flaresolverr_url,
-                            "https://annas-archive.li",
+            async with LibgenSearch() as t:
+                titles = await t.search_comicvine_id(
+                    api_key=get_api_key(),
+                    id=cv_id,
+                    issue_number=issue_number,
+                    libgen_site_url="https://libgen.la",
+                    libgen_series_id=libgen_series_id,
+                    search_unsorted=search_unsorted,
+                    flaresolverr_url=flaresolverr_url,
+                )
+                for elem in titles:
+                    print(elem)
+                    if flaresolverr_url is not None:
+                        print(
+                            await t.get_annas_archive_download(
+                                elem.md5,
+                                flaresolverr_url,
+                                "https://annas-archive.li",
+                            )
                         )
-                    )
         except KeyboardInterrupt:
             print("\nExiting program...")
             exit(0)
@@ -0,0 +1,111 @@
+import asyncio
+from itertools import count
+
+import aiohttp
+from aiohttp import web
+
+from libgencomics.common import FlareSolverrPool
+from libgencomics.errors import LibgenFlareSolverrException
+
+
+# a flaresolverr whose first sessions fail every request they are given
+class StubFlareSolverr:
+    def __init__(self, failing_sessions: int) -> None:
+        self.failing_sessions = failing_sessions
+        self.__ids = count(1)
+        self.created: list[int] = []
+        self.destroyed: list[int] = []
+        self.__runner: web.AppRunner | None = None
+
+    async def command(self, request: web.Request) -> web.Response:
+        data = await request.json()
+
+        if data["cmd"] == "sessions.create":
+            self.created.append(next(self.__ids))
+            return web.json_response({"status": "ok", "session": self.created[-1]})
+        elif data["cmd"] == "sessions.destroy":
+            self.destroyed.append(int(data["session"]))
+        elif data["cmd"] == "request.get":
+            # let every caller reach the pool before the first failure
+            await asyncio.sleep(0.05)
+            if int(data["session"]) <= self.failing_sessions:
+                return web.json_response({"status": "error"})
+            return web.json_response(
+                {"status": "ok", "solution": {"response": data["url"]}}
+            )
+        return web.json_response({"status": "ok"})
+
+    async def start(self) -> str:
+        app = web.Application()
+        app.router.add_post("/v1", self.command)
+        self.__runner = web.AppRunner(app)
+        await self.__runner.setup()
+        site = web.TCPSite(self.__runner, "127.0.0.1", 0)
+        await site.start()
+        port = self.__runner.addresses[0][1]
+        return f"http://127.0.0.1:{port}/v1"
+
+    async def stop(self) -> None:
+        if self.__runner is not None:
+            await self.__runner.cleanup()
+
+
+# callers waiting on a full pool get a new session once failed ones free
+# their slot instead of waiting forever for one to be returned
+async def waiters_replace_failed_sessions() -> None:
+    stub = StubFlareSolverr(failing_sessions=2)
+    flaresolverr_url = await stub.start()
+    pool = FlareSolverrPool(flaresolverr_url, size=2)
+
+    try:
+        async with aiohttp.ClientSession() as session:
+            results = await asyncio.wait_for(
+                asyncio.gather(
+                    *[pool.solve(session, f"http://libgen/{i}") for i in range(3)],
+                    return_exceptions=True,
+                ),
+                timeout=5,
+            )
+            await pool.close(session)
+    finally:
+        await stub.stop()
+
+    failures = [r for r in results if isinstance(r, LibgenFlareSolverrException)]
+    solutions = [r for r in results if isinstance(r, dict)]
+    assert len(failures) == 2, results
+    assert solutions == [{"response": "http://libgen/2"}], results
+
+
+# the browsers of failed sessions are closed as soon as they are dropped, not
+# left running until the pool is closed
+async def failed_sessions_are_destroyed() -> None:
+    stub = StubFlareSolverr(failing_sessions=3)
+    flaresolverr_url = await stub.start()
+    pool = FlareSolverrPool(flaresolverr_url, size=1)
+
+    try:
+        async with aiohttp.ClientSession() as session:
+            results = await asyncio.wait_for(
+                asyncio.gather(
+                    *[pool.solve(session, f"http://libgen/{i}") for i in range(5)],
+                    return_exceptions=True,
+                ),
+                timeout=5,
+            )
+            destroyed_before_close = list(stub.destroyed)
+            await pool.close(session)
+    finally:
+        await stub.stop()
+
+    failures = [r for r in results if isinstance(r, LibgenFlareSolverrException)]
+    assert len(failures) == 3, results
+    assert stub.created == [1, 2, 3, 4], stub.created
+    assert sorted(destroyed_before_close) == [1, 2, 3], destroyed_before_close
+    assert sorted(stub.destroyed) == stub.created, stub.destroyed
+
+
+if __name__ == "__main__":
+    asyncio.run(waiters_replace_failed_sessions())
+    print("FlareSolverrPool: waiters replace failed sessions")
+    asyncio.run(failed_sessions_are_destroyed())
+    print("FlareSolverrPool: failed sessions are destroyed")